@@ -0,0 +1,88 @@
+"""add tool call complexity
+
+Revision ID: a3f1c2d4e5b6
+Revises: d46c3129fe0d
+Create Date: 2026-10-16 10:12:41.318204
+
+"""
+import json
+from typing import Any, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c2d4e5b6'
+down_revision: Union[str, Sequence[str], None] = 'd46c3129fe0d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Scoring frozen as of this revision (ops_model/complexity.py may change later)
+QUERY_TOOL_NAME = 'query_database'
+
+
+def _query_complexity(sql: str) -> int:
+    query = sql.upper()
+
+    score = 0
+    if "WITH" in query[:10] or " WITH " in query:
+        score += 3
+    if " OVER(" in query or " OVER (" in query:
+        score += 2
+    score += query.count(" JOIN ")
+    if query.count("SELECT") > 1:
+        score += 2
+    if " GROUP BY " in query:
+        score += 1
+
+    if score >= 4:
+        return 3
+    if score >= 2 or query.count("\n") > 5:
+        return 2
+    return 1
+
+
+def _complexity(input_params: Any) -> int:
+    try:
+        params = input_params if isinstance(input_params, dict) else json.loads(input_params)
+        return _query_complexity(params.get("sql", ""))
+    except Exception:
+        return 1
+
+
+def upgrade() -> None:
+    """Add tool_calls.complexity and backfill it for existing query_database calls."""
+    op.add_column('tool_calls', sa.Column('complexity', sa.SmallInteger(), nullable=True))
+
+    tool_calls = sa.table(
+        'tool_calls',
+        sa.column('id', sa.String),
+        sa.column('tool_name', sa.String),
+        sa.column('input_params', sa.JSON),
+        sa.column('complexity', sa.SmallInteger),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(tool_calls.c.id, tool_calls.c.input_params).where(
+            tool_calls.c.tool_name == QUERY_TOOL_NAME
+        )
+    )
+    updates = [
+        {"tool_call_id": tool_call_id, "new_complexity": _complexity(input_params)}
+        for tool_call_id, input_params in rows
+    ]
+    if updates:
+        # One executemany instead of a round-trip per row
+        bind.execute(
+            tool_calls.update()
+            .where(tool_calls.c.id == sa.bindparam('tool_call_id'))
+            .values(complexity=sa.bindparam('new_complexity')),
+            updates,
+        )
+
+
+def downgrade() -> None:
+    """Drop tool_calls.complexity."""
+    op.drop_column('tool_calls', 'complexity')
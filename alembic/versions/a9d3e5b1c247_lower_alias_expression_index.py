@@ -0,0 +1,32 @@
+"""lower(alias) expression index on archetype_aliases
+
+Revision ID: a9d3e5b1c247
+Revises: f3c8a2e7b190
+Create Date: 2026-10-16 14:41:18.337052
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d3e5b1c247"
+down_revision: Union[str, Sequence[str], None] = "f3c8a2e7b190"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Exact alias lookups filter on LOWER(alias); index the expression so they seek
+    op.create_index(
+        "idx_archetype_alias_lower", "archetype_aliases", [sa.text("lower(alias)")]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_archetype_alias_lower", table_name="archetype_aliases")
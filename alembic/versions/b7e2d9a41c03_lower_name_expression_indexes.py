@@ -0,0 +1,32 @@
+"""lower(name) expression indexes on archetypes and cards
+
+Revision ID: b7e2d9a41c03
+Revises: ce8d1497fd5a
+Create Date: 2026-10-16 11:04:52.611873
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2d9a41c03"
+down_revision: Union[str, Sequence[str], None] = "ce8d1497fd5a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Name lookups filter on LOWER(name); index the expression so they seek
+    op.create_index("idx_archetype_name_lower", "archetypes", [sa.text("lower(name)")])
+    op.create_index("idx_card_name_lower", "cards", [sa.text("lower(name)")])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_card_name_lower", table_name="cards")
+    op.drop_index("idx_archetype_name_lower", table_name="archetypes")
@@ -0,0 +1,87 @@
+"""add card_daily_stats rollup table
+
+Revision ID: b8f4c6d2a735
+Revises: a9d3e5b1c247
+Create Date: 2026-10-16 15:27:52.904163
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8f4c6d2a735"
+down_revision: Union[str, Sequence[str], None] = "a9d3e5b1c247"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Full rebuild, frozen as of this revision (refresh_rollups.py may change later)
+_BACKFILL_SQL = """
+    INSERT INTO card_daily_stats (
+        card_id, date, format_id, board, decks_playing, total_copies, deck_rows
+    )
+    SELECT
+        dc.card_id,
+        date(t.date),
+        t.format_id,
+        dc.board,
+        COUNT(DISTINCT te.id),
+        SUM(dc.count),
+        COUNT(*)
+    FROM tournaments t
+    JOIN tournament_entries te ON te.tournament_id = t.id
+    JOIN deck_cards dc ON dc.entry_id = te.id
+    GROUP BY dc.card_id, date(t.date), t.format_id, dc.board
+    UNION ALL
+    SELECT
+        dc.card_id,
+        date(t.date),
+        t.format_id,
+        'ALL',
+        COUNT(DISTINCT te.id),
+        SUM(dc.count),
+        COUNT(*)
+    FROM tournaments t
+    JOIN tournament_entries te ON te.tournament_id = t.id
+    JOIN deck_cards dc ON dc.entry_id = te.id
+    GROUP BY dc.card_id, date(t.date), t.format_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "card_daily_stats",
+        sa.Column("card_id", sa.String(length=36), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("format_id", sa.String(length=36), nullable=False),
+        sa.Column("board", sa.String(length=4), nullable=False),
+        sa.Column("decks_playing", sa.Integer(), nullable=False),
+        sa.Column("total_copies", sa.Integer(), nullable=False),
+        sa.Column("deck_rows", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["card_id"],
+            ["cards.id"],
+            name="fk_card_daily_stats_card",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("card_id", "date", "format_id", "board"),
+    )
+    op.create_index(
+        "idx_card_daily_stats_format_date",
+        "card_daily_stats",
+        ["format_id", "date"],
+    )
+
+    # Backfill from existing deck lists
+    op.execute(sa.text(_BACKFILL_SQL))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_card_daily_stats_format_date", table_name="card_daily_stats")
+    op.drop_table("card_daily_stats")
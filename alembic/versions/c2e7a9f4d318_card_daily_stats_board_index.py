@@ -0,0 +1,42 @@
+"""index card_daily_stats on (format_id, board, date)
+
+Revision ID: c2e7a9f4d318
+Revises: b8f4c6d2a735
+Create Date: 2026-10-16 16:05:37.612840
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2e7a9f4d318"
+down_revision: Union[str, Sequence[str], None] = "b8f4c6d2a735"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Card presence seeks one board per window; (format_id, date) left the
+    # board filter to discard two rows out of three
+    op.drop_index("idx_card_daily_stats_format_date", table_name="card_daily_stats")
+    op.create_index(
+        "idx_card_daily_stats_format_board_date",
+        "card_daily_stats",
+        ["format_id", "board", "date"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_card_daily_stats_format_board_date", table_name="card_daily_stats"
+    )
+    op.create_index(
+        "idx_card_daily_stats_format_date",
+        "card_daily_stats",
+        ["format_id", "date"],
+    )
@@ -0,0 +1,85 @@
+"""add archetype_daily_stats rollup table
+
+Revision ID: c4a8e3f19d27
+Revises: b7e2d9a41c03
+Create Date: 2026-10-16 11:48:09.204417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8e3f19d27"
+down_revision: Union[str, Sequence[str], None] = "b7e2d9a41c03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Full rebuild, frozen as of this revision (refresh_rollups.py may change later)
+_BACKFILL_SQL = """
+    INSERT INTO archetype_daily_stats (
+        archetype_id, date, format_id, entries, tournaments,
+        wins, losses, draws, mirror_wins, mirror_losses, mirror_draws
+    )
+    SELECT
+        te.archetype_id,
+        date(t.date),
+        t.format_id,
+        COUNT(DISTINCT te.id),
+        COUNT(DISTINCT t.id),
+        COUNT(CASE WHEN m.result = 'WIN' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'WIN' AND m.mirror THEN 1 END),
+        COUNT(CASE WHEN m.result = 'LOSS' AND m.mirror THEN 1 END),
+        COUNT(CASE WHEN m.result = 'DRAW' AND m.mirror THEN 1 END)
+    FROM tournaments t
+    JOIN tournament_entries te ON te.tournament_id = t.id
+    LEFT JOIN matches m ON m.entry_id = te.id
+    GROUP BY te.archetype_id, date(t.date), t.format_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "archetype_daily_stats",
+        sa.Column("archetype_id", sa.String(length=36), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("format_id", sa.String(length=36), nullable=False),
+        sa.Column("entries", sa.Integer(), nullable=False),
+        sa.Column("tournaments", sa.Integer(), nullable=False),
+        sa.Column("wins", sa.Integer(), nullable=False),
+        sa.Column("losses", sa.Integer(), nullable=False),
+        sa.Column("draws", sa.Integer(), nullable=False),
+        sa.Column("mirror_wins", sa.Integer(), nullable=False),
+        sa.Column("mirror_losses", sa.Integer(), nullable=False),
+        sa.Column("mirror_draws", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["archetype_id"],
+            ["archetypes.id"],
+            name="fk_archetype_daily_stats_archetype",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("archetype_id", "date"),
+    )
+    op.create_index(
+        "idx_archetype_daily_stats_format_date",
+        "archetype_daily_stats",
+        ["format_id", "date"],
+    )
+
+    # Backfill from existing matches
+    op.execute(sa.text(_BACKFILL_SQL))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_archetype_daily_stats_format_date", table_name="archetype_daily_stats"
+    )
+    op.drop_table("archetype_daily_stats")
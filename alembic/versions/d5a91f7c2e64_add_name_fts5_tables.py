@@ -0,0 +1,91 @@
+"""FTS5 mirrors of archetype and card names
+
+Revision ID: d5a91f7c2e64
+Revises: c4a8e3f19d27
+Create Date: 2026-10-16 12:31:27.540913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a91f7c2e64"
+down_revision: Union[str, Sequence[str], None] = "c4a8e3f19d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# DDL frozen as of this revision (models/search.py may change later)
+_ARCHETYPES_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS archetypes_fts
+    USING fts5(name, archetype_id UNINDEXED, tokenize='unicode61 remove_diacritics 2')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archetypes_fts_ai AFTER INSERT ON archetypes BEGIN
+        INSERT INTO archetypes_fts(name, archetype_id) VALUES (new.name, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archetypes_fts_ad AFTER DELETE ON archetypes BEGIN
+        DELETE FROM archetypes_fts WHERE archetype_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archetypes_fts_au AFTER UPDATE OF name ON archetypes BEGIN
+        DELETE FROM archetypes_fts WHERE archetype_id = old.id;
+        INSERT INTO archetypes_fts(name, archetype_id) VALUES (new.name, new.id);
+    END
+    """,
+]
+
+_CARDS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts
+    USING fts5(name, card_id UNINDEXED, tokenize='unicode61 remove_diacritics 2')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_ai AFTER INSERT ON cards BEGIN
+        INSERT INTO cards_fts(name, card_id) VALUES (new.name, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_ad AFTER DELETE ON cards BEGIN
+        DELETE FROM cards_fts WHERE card_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_au AFTER UPDATE OF name ON cards BEGIN
+        DELETE FROM cards_fts WHERE card_id = old.id;
+        INSERT INTO cards_fts(name, card_id) VALUES (new.name, new.id);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in _ARCHETYPES_FTS_DDL + _CARDS_FTS_DDL:
+        op.execute(sa.text(statement))
+
+    # Backfill from existing rows; triggers keep them in sync from here on
+    op.execute(
+        sa.text(
+            "INSERT INTO archetypes_fts(name, archetype_id) SELECT name, id FROM archetypes"
+        )
+    )
+    op.execute(
+        sa.text("INSERT INTO cards_fts(name, card_id) SELECT name, id FROM cards")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("cards", "archetypes"):
+        for suffix in ("au", "ad", "ai"):
+            op.execute(sa.text(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}"))
+        op.execute(sa.text(f"DROP TABLE IF EXISTS {table}_fts"))
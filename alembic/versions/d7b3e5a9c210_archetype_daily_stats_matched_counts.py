@@ -0,0 +1,73 @@
+"""add matched entry/tournament counts to archetype_daily_stats
+
+Revision ID: d7b3e5a9c210
+Revises: c2e7a9f4d318
+Create Date: 2026-10-16 18:22:51.907316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7b3e5a9c210"
+down_revision: Union[str, Sequence[str], None] = "c2e7a9f4d318"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Full rebuild, frozen as of this revision (refresh_rollups.py may change later)
+_BACKFILL_SQL = """
+    INSERT INTO archetype_daily_stats (
+        archetype_id, date, format_id, entries, tournaments,
+        matched_entries, matched_tournaments,
+        wins, losses, draws, mirror_wins, mirror_losses, mirror_draws
+    )
+    SELECT
+        te.archetype_id,
+        date(t.date),
+        t.format_id,
+        COUNT(DISTINCT te.id),
+        COUNT(DISTINCT t.id),
+        COUNT(DISTINCT m.entry_id),
+        COUNT(DISTINCT CASE WHEN m.entry_id IS NOT NULL THEN t.id END),
+        COUNT(CASE WHEN m.result = 'WIN' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'WIN' AND m.mirror THEN 1 END),
+        COUNT(CASE WHEN m.result = 'LOSS' AND m.mirror THEN 1 END),
+        COUNT(CASE WHEN m.result = 'DRAW' AND m.mirror THEN 1 END)
+    FROM tournaments t
+    JOIN tournament_entries te ON te.tournament_id = t.id
+    LEFT JOIN matches m ON m.entry_id = te.id
+    GROUP BY te.archetype_id, date(t.date), t.format_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The meta report only counts entries that played a recorded match
+    with op.batch_alter_table("archetype_daily_stats", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "matched_entries", sa.Integer(), nullable=False, server_default="0"
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "matched_tournaments", sa.Integer(), nullable=False, server_default="0"
+            )
+        )
+
+    op.execute(sa.text("DELETE FROM archetype_daily_stats"))
+    op.execute(sa.text(_BACKFILL_SQL))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("archetype_daily_stats", schema=None) as batch_op:
+        batch_op.drop_column("matched_tournaments")
+        batch_op.drop_column("matched_entries")
@@ -0,0 +1,48 @@
+"""covering indexes for deck_cards, matches, entries and tournaments joins
+
+Revision ID: e2b64c8d9f15
+Revises: d5a91f7c2e64
+Create Date: 2026-10-16 13:22:05.118394
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b64c8d9f15"
+down_revision: Union[str, Sequence[str], None] = "d5a91f7c2e64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Supersedes idx_deck_card_entry_board (same leading columns)
+    op.create_index(
+        "idx_deck_card_entry_board_card",
+        "deck_cards",
+        ["entry_id", "board", "card_id", "count"],
+    )
+    op.drop_index("idx_deck_card_entry_board", table_name="deck_cards")
+    op.create_index("idx_match_entry_result", "matches", ["entry_id", "result"])
+    op.create_index(
+        "idx_entry_archetype_tournament",
+        "tournament_entries",
+        ["archetype_id", "tournament_id"],
+    )
+    op.create_index("idx_tournament_format_date", "tournaments", ["format_id", "date"])
+
+    # Refresh planner statistics so the new indexes are picked up
+    op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_tournament_format_date", table_name="tournaments")
+    op.drop_index("idx_entry_archetype_tournament", table_name="tournament_entries")
+    op.drop_index("idx_match_entry_result", table_name="matches")
+    op.create_index("idx_deck_card_entry_board", "deck_cards", ["entry_id", "board"])
+    op.drop_index("idx_deck_card_entry_board_card", table_name="deck_cards")
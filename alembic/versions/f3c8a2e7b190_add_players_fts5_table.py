@@ -0,0 +1,68 @@
+"""FTS5 trigram mirror of player handles
+
+Revision ID: f3c8a2e7b190
+Revises: e2b64c8d9f15
+Create Date: 2026-10-16 14:07:33.902615
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c8a2e7b190"
+down_revision: Union[str, Sequence[str], None] = "e2b64c8d9f15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# DDL frozen as of this revision (models/search.py may change later)
+_PLAYERS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS players_fts
+    USING fts5(handle, normalized_handle, player_id UNINDEXED, tokenize='trigram')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_ai AFTER INSERT ON players BEGIN
+        INSERT INTO players_fts(handle, normalized_handle, player_id)
+        VALUES (new.handle, new.normalized_handle, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_ad AFTER DELETE ON players BEGIN
+        DELETE FROM players_fts WHERE player_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_au
+    AFTER UPDATE OF handle, normalized_handle ON players BEGIN
+        DELETE FROM players_fts WHERE player_id = old.id;
+        INSERT INTO players_fts(handle, normalized_handle, player_id)
+        VALUES (new.handle, new.normalized_handle, new.id);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in _PLAYERS_FTS_DDL:
+        op.execute(sa.text(statement))
+
+    # Backfill from existing rows; triggers keep it in sync from here on
+    op.execute(
+        sa.text(
+            "INSERT INTO players_fts(handle, normalized_handle, player_id) "
+            "SELECT handle, normalized_handle, id FROM players"
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for suffix in ("au", "ad", "ai"):
+        op.execute(sa.text(f"DROP TRIGGER IF EXISTS players_fts_{suffix}"))
+    op.execute(sa.text("DROP TABLE IF EXISTS players_fts"))
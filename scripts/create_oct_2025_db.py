@@ -8,6 +8,7 @@ This script:
 - Filters tournaments to only those from Oct 1, 2025 onwards
 - Copies only relevant players, archetypes, entries, deck_cards, and matches
 - Copies relevant meta_changes
+- Rebuilds the daily stats rollups from the copied rows
 """
 
 import sys
@@ -31,6 +32,7 @@ from models import (
     Match,
     MetaChange,
 )
+from ingest.refresh_rollups import refresh_all_rollups
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -310,6 +312,12 @@ def create_filtered_database(
         target_session.flush()
         print(f"  Copied {len(meta_changes)} meta changes")
 
+        # 10. Rebuild the rollups the analysis queries read
+        print("\nRebuilding daily stats rollups...")
+        written = refresh_all_rollups(target_session)
+        for table, rows in written.items():
+            print(f"  {table}: {rows} rows")
+
         # Commit everything
         print("\nCommitting changes...")
         target_session.commit()
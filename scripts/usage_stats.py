@@ -7,7 +7,7 @@ from the ops database.
 """
 
 import sys
-import json
+from collections import Counter
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -16,6 +16,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 from src.ops_model.base import get_ops_session_factory
 from src.ops_model.chat_models import ChatSession, ChatMessage, ToolCall, ToolResult
+from src.ops_model.complexity import (
+    COMPLEX,
+    MEDIUM,
+    QUERY_TOOL_NAME,
+    SIMPLE,
+    tool_call_complexity,
+)
 from sqlalchemy import func, extract
 
 
@@ -99,41 +106,38 @@ def main():
         # 4. Query complexity
         print("\n\n🔍 4. QUERY COMPLEXITY (query_database tool)")
         print("-" * 70)
-        query_calls = (
-            session.query(ToolCall).filter(ToolCall.tool_name == "query_database").all()
+        # Complexity is stored on each row at insert time; aggregate it in SQL.
+        by_complexity: Counter = Counter()
+        for complexity, count in (
+            session.query(ToolCall.complexity, func.count(ToolCall.id))
+            .filter(
+                ToolCall.tool_name == QUERY_TOOL_NAME,
+                ToolCall.complexity.isnot(None),
+            )
+            .group_by(ToolCall.complexity)
+        ):
+            by_complexity[complexity] = count
+
+        # Rows logged before the complexity column existed are scored here.
+        # Only the input_params column is needed; stream it in chunks so the
+        # full ToolCall rows are never hydrated.
+        unscored_params = (
+            session.query(ToolCall.input_params)
+            .filter(
+                ToolCall.tool_name == QUERY_TOOL_NAME,
+                ToolCall.complexity.is_(None),
+            )
+            .yield_per(1000)
+        )
+        by_complexity.update(
+            tool_call_complexity(QUERY_TOOL_NAME, input_params)
+            for (input_params,) in unscored_params
         )
 
-        simple = medium = complex_q = 0
-        for tc in query_calls:
-            try:
-                params = (
-                    tc.input_params
-                    if isinstance(tc.input_params, dict)
-                    else json.loads(tc.input_params)
-                )
-                query = params.get("sql", "").upper()
-
-                score = 0
-                if "WITH" in query[:10] or " WITH " in query:
-                    score += 3
-                if " OVER(" in query or " OVER (" in query:
-                    score += 2
-                score += query.count(" JOIN ")
-                if query.count("SELECT") > 1:
-                    score += 2
-                if " GROUP BY " in query:
-                    score += 1
-
-                if score >= 4:
-                    complex_q += 1
-                elif score >= 2 or query.count("\n") > 5:
-                    medium += 1
-                else:
-                    simple += 1
-            except Exception:
-                simple += 1
-
-        total_queries = len(query_calls)
+        simple = by_complexity[SIMPLE]
+        medium = by_complexity[MEDIUM]
+        complex_q = by_complexity[COMPLEX]
+        total_queries = simple + medium + complex_q
         if total_queries > 0:
             print(f"Total Queries Analyzed: {total_queries:,}")
             print("\nComplexity Distribution:")
@@ -1,174 +1,300 @@
-from typing import Dict, Any, Optional
+import difflib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, Tuple
+
+import orjson
+from cachetools import TTLCache
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+
+from ..models.search import fts_match_query
+
+
+def _cutoff(days_back: int) -> str:
+    """ISO date `days_back` days before today (UTC, like SQLite's date('now'))."""
+    return (
+        datetime.now(timezone.utc).date() - timedelta(days=int(days_back))
+    ).isoformat()
 
 
 def _find_archetype_fuzzy(
     engine: Engine, archetype_name: str
 ) -> Optional[Dict[str, Any]]:
-    """Find archetype using fuzzy matching with fallback strategies."""
-    # Strategy 1: Exact match (case-insensitive)
-    exact_sql = """
-        SELECT a.id, a.name, f.name as format_name
-        FROM archetypes a
-        JOIN formats f ON a.format_id = f.id
-        WHERE LOWER(a.name) = LOWER(:archetype_name)
+    """Find archetype using fuzzy matching, memoized per engine and lowercased name."""
+    name = archetype_name.strip().lower()
+    # Exact names are answered from the in-memory name index without SQL
+    exact = _archetype_names(engine).get(name)
+    if exact:
+        return dict(exact)
+
+    key = (engine, name)
+    with _fuzzy_match_lock:
+        match = _fuzzy_match_cache.get(key)
+        missed = key in _fuzzy_miss_cache
+    if missed:
+        return None
+    if match is None:
+        with engine.connect() as conn:
+            match = _find_archetype_fuzzy_sql(conn, name)
+        with _fuzzy_match_lock:
+            if match is None:
+                _fuzzy_miss_cache[key] = True
+                return None
+            _fuzzy_match_cache[key] = match
+    return dict(match)
+
+
+def _suggest_archetype(engine: Engine, archetype_name: str) -> Optional[str]:
+    """Closest archetype name for a "did you mean" hint; never used as a match."""
+    candidates = _archetype_names(engine)
+    close = difflib.get_close_matches(
+        archetype_name.strip().lower(), candidates, n=1, cutoff=_TYPO_MATCH_CUTOFF
+    )
+    return candidates[close[0]]["name"] if close else None
+
+
+def clear_archetype_cache() -> None:
+    """Drop memoized archetype lookups (call after archetypes/aliases change)."""
+    with _fuzzy_match_lock:
+        _fuzzy_match_cache.clear()
+        _fuzzy_miss_cache.clear()
+    _archetype_name_cache.clear()
+
+
+# Strategies 1-3 in one FTS5 round-trip, ranked:
+# exact > prefix > every word present (shortest first)
+_RANKED_ARCHETYPE_SQL = text(
     """
-    with engine.connect() as conn:
-        result = conn.execute(
-            text(exact_sql), {"archetype_name": archetype_name}
-        ).first()
-        if result:
-            return dict(result._mapping)
+    SELECT a.id, a.name, f.name as format_name
+    FROM archetypes_fts
+    JOIN archetypes a ON a.id = archetypes_fts.archetype_id
+    JOIN formats f ON a.format_id = f.id
+    WHERE archetypes_fts MATCH :match
+    ORDER BY
+        CASE
+            WHEN LOWER(a.name) = :archetype_name THEN 0
+            WHEN LOWER(a.name) LIKE :prefix THEN 1
+            ELSE 2
+        END,
+        LENGTH(a.name)
+    LIMIT 1
+    """
+)
 
-    # Strategy 2: Partial match (contains)
-    partial_sql = """
-        SELECT a.id, a.name, f.name as format_name
-        FROM archetypes a
-        JOIN formats f ON a.format_id = f.id
-        WHERE LOWER(a.name) LIKE LOWER(:pattern)
-        ORDER BY LENGTH(a.name)
-        LIMIT 1
+
+_EXACT_ALIAS_SQL = text(
     """
-    with engine.connect() as conn:
-        pattern = f"%{archetype_name}%"
-        result = conn.execute(text(partial_sql), {"pattern": pattern}).first()
-        if result:
-            return dict(result._mapping)
+    SELECT a.id, a.name, f.name as format_name
+    FROM archetype_aliases aa
+    JOIN archetypes a ON aa.archetype_id = a.id
+    JOIN formats f ON a.format_id = f.id
+    WHERE LOWER(aa.alias) = :archetype_name
+    ORDER BY aa.confidence_score DESC
+    LIMIT 1
+    """
+)
+
+
+_PARTIAL_ALIAS_SQL = text(
+    """
+    SELECT a.id, a.name, f.name as format_name
+    FROM archetype_aliases aa
+    JOIN archetypes a ON aa.archetype_id = a.id
+    JOIN formats f ON a.format_id = f.id
+    WHERE LOWER(aa.alias) LIKE :pattern
+    ORDER BY aa.confidence_score DESC, LENGTH(aa.alias)
+    LIMIT 1
+    """
+)
+
 
-    # Strategy 3: Word-based matching (split and match individual words)
-    words = archetype_name.lower().split()
-    if len(words) > 1:
-        word_conditions = []
-        params = {}
-        for i, word in enumerate(words):
-            word_conditions.append(f"LOWER(a.name) LIKE :word_{i}")
-            params[f"word_{i}"] = f"%{word}%"
-
-        word_sql = f"""
-            SELECT a.id, a.name, f.name as format_name
-            FROM archetypes a
-            JOIN formats f ON a.format_id = f.id
-            WHERE {" AND ".join(word_conditions)}
-            ORDER BY LENGTH(a.name)
-            LIMIT 1
-        """
+_ARCHETYPE_NAMES_SQL = text(
+    """
+    SELECT a.id, a.name, f.name as format_name
+    FROM archetypes a
+    JOIN formats f ON a.format_id = f.id
+    ORDER BY LENGTH(a.name)
+    """
+)
+
+_ARCHETYPE_NAMES_TTL_SECONDS = 300
+_FUZZY_MISS_TTL_SECONDS = 30
+_TYPO_MATCH_CUTOFF = 0.75
+
+# engine -> (loaded_at, {lowercased name: archetype row})
+_archetype_name_cache: Dict[Engine, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+_archetype_name_lock = threading.Lock()
+
+# (engine, lowercased name) -> resolved archetype row. Expires like the name
+# index, so archetypes deleted, merged or re-ingested by other processes stop
+# resolving to stale ids.
+_fuzzy_match_cache: TTLCache = TTLCache(maxsize=512, ttl=_ARCHETYPE_NAMES_TTL_SECONDS)
+# (engine, lowercased name) for lookups that found nothing; kept briefly so a
+# repeated miss skips the SQL strategies but a new archetype shows up soon
+_fuzzy_miss_cache: TTLCache = TTLCache(maxsize=512, ttl=_FUZZY_MISS_TTL_SECONDS)
+_fuzzy_match_lock = threading.Lock()
+
+
+def _archetype_names(engine: Engine) -> Dict[str, Dict[str, Any]]:
+    """All archetype names (lowercased) mapped to their row, reloaded every few minutes."""
+    cached = _archetype_name_cache.get(engine)
+    if cached and time.monotonic() - cached[0] < _ARCHETYPE_NAMES_TTL_SECONDS:
+        return cached[1]
+    with _archetype_name_lock:
+        # Another thread may have reloaded while we waited
+        cached = _archetype_name_cache.get(engine)
+        if cached and time.monotonic() - cached[0] < _ARCHETYPE_NAMES_TTL_SECONDS:
+            return cached[1]
+        names: Dict[str, Dict[str, Any]] = {}
         with engine.connect() as conn:
-            result = conn.execute(text(word_sql), params).first()
-            if result:
-                return dict(result._mapping)
+            for row in conn.execute(_ARCHETYPE_NAMES_SQL):
+                # Shortest-first, so a name shared across formats keeps one entry
+                names.setdefault(row.name.lower(), dict(row._mapping))
+        _archetype_name_cache[engine] = (time.monotonic(), names)
+        return names
+
+
+def _find_archetype_fuzzy_sql(
+    conn: Connection, archetype_name: str
+) -> Optional[Dict[str, Any]]:
+    """Find archetype using fuzzy matching with fallback strategies on one connection."""
+    name = archetype_name.lower()
+    match = fts_match_query(name)
+    if match:
+        result = conn.execute(
+            _RANKED_ARCHETYPE_SQL,
+            {"match": match, "archetype_name": name, "prefix": f"{name}%"},
+        ).first()
+        if result:
+            return dict(result._mapping)
 
     # Strategy 4a: Exact alias match
     print(
         f"DEBUG: Trying exact alias matching for '{archetype_name}' (Strategy 4a)",
         flush=True,
     )
-    exact_alias_sql = """
-        SELECT a.id, a.name, f.name as format_name
-        FROM archetype_aliases aa
-        JOIN archetypes a ON aa.archetype_id = a.id
-        JOIN formats f ON a.format_id = f.id
-        WHERE LOWER(aa.alias) = LOWER(:archetype_name)
-        ORDER BY aa.confidence_score DESC
-        LIMIT 1
-    """
-    with engine.connect() as conn:
-        result = conn.execute(
-            text(exact_alias_sql), {"archetype_name": archetype_name}
-        ).first()
-        if result:
-            print(
-                f"DEBUG: Found exact alias match: {dict(result._mapping)}", flush=True
-            )
-            return dict(result._mapping)
+    result = conn.execute(_EXACT_ALIAS_SQL, {"archetype_name": archetype_name}).first()
+    if result:
+        print(f"DEBUG: Found exact alias match: {dict(result._mapping)}", flush=True)
+        return dict(result._mapping)
 
     # Strategy 4b: Partial alias match (contains)
     print(
         f"DEBUG: Trying partial alias matching for '{archetype_name}' (Strategy 4b)",
         flush=True,
     )
-    partial_alias_sql = """
-        SELECT a.id, a.name, f.name as format_name
-        FROM archetype_aliases aa
-        JOIN archetypes a ON aa.archetype_id = a.id
-        JOIN formats f ON a.format_id = f.id
-        WHERE LOWER(aa.alias) LIKE LOWER(:pattern)
-        ORDER BY aa.confidence_score DESC, LENGTH(aa.alias)
-        LIMIT 1
-    """
-    with engine.connect() as conn:
-        pattern = f"%{archetype_name}%"
-        result = conn.execute(text(partial_alias_sql), {"pattern": pattern}).first()
-        if result:
-            print(
-                f"DEBUG: Found partial alias match: {dict(result._mapping)}", flush=True
-            )
-            return dict(result._mapping)
+    pattern = f"%{archetype_name}%"
+    result = conn.execute(_PARTIAL_ALIAS_SQL, {"pattern": pattern}).first()
+    if result:
+        print(f"DEBUG: Found partial alias match: {dict(result._mapping)}", flush=True)
+        return dict(result._mapping)
 
     return None
 
 
-def compute_archetype_overview(engine: Engine, archetype_name: str) -> Dict[str, Any]:
-    """
-    Shared logic to compute archetype overview with recent performance and key cards.
-    Mirrors the previous MCP implementation but is reusable by other apps.
+# Match results are counted per result value first, so the win/loss CASE
+# pivot runs over at most three rows instead of every match. The top cards
+# ride along as a JSON array so the overview is a single round-trip.
+_OVERVIEW_SQL = text(
     """
-    # Find archetype using fuzzy matching
-    arch_match = _find_archetype_fuzzy(engine, archetype_name)
-    if not arch_match:
-        return {
-            "error": f"Archetype '{archetype_name}' not found. ACTION REQUIRED: 1) Analyze deck cards/composition to identify intended archetype, 2) Call get_archetype_overview() on target archetype to get ID, 3) Call add_archetype_alias() to create mapping, 4) Retry original query. If no clear match found, inform user data unavailable."
-        }
-
-    # Use the found archetype name for the main query
-    found_name = arch_match["name"]
-
-    # Get archetype info with recent performance
-    sql = """
+    WITH entries AS (
+        SELECT id, tournament_id
+        FROM tournament_entries
+        WHERE archetype_id = :archetype_id
+    ),
+    results AS (
+        SELECT m.result, COUNT(*) as n
+        FROM entries e
+        JOIN matches m ON m.entry_id = e.id
+        GROUP BY m.result
+    ),
+    totals AS (
         SELECT
-            a.id as archetype_id,
-            a.name as archetype_name,
-            f.name as format_name,
-            f.id as format_id,
-            COUNT(DISTINCT te.id) as recent_entries,
-            COUNT(DISTINCT t.id) as tournaments_played,
-            ROUND(
-                CAST(COUNT(CASE WHEN m.result = 'WIN' THEN 1 END) AS REAL) /
-                CAST((COUNT(CASE WHEN m.result = 'WIN' THEN 1 END) + COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END)) AS REAL) * 100, 1
-            ) as winrate_no_draws
-        FROM archetypes a
-        JOIN formats f ON a.format_id = f.id
-        LEFT JOIN tournament_entries te ON a.id = te.archetype_id
-        LEFT JOIN tournaments t ON te.tournament_id = t.id AND t.date >= date('now', '-30 days')
-        LEFT JOIN matches m ON te.id = m.entry_id
-        WHERE LOWER(a.name) = LOWER(:archetype_name)
-        GROUP BY a.id, a.name, f.name, f.id
-    """
-    with engine.connect() as conn:
-        arch_info = (
-            conn.execute(text(sql), {"archetype_name": found_name}).mappings().first()
-        )
-
-    # Get top cards
-    cards_sql = """
+            COALESCE(SUM(CASE WHEN result = 'WIN' THEN n END), 0) as wins,
+            COALESCE(SUM(CASE WHEN result = 'LOSS' THEN n END), 0) as losses
+        FROM results
+    ),
+    top_cards AS (
         SELECT 
             c.name as card_name,
-            COUNT(DISTINCT te.id) as decks_playing,
+            COUNT(*) as decks_playing,
             ROUND(AVG(CAST(dc.count AS REAL)), 1) as avg_copies
-        FROM deck_cards dc
+        FROM entries e
+        JOIN tournaments t ON e.tournament_id = t.id
+        JOIN deck_cards dc ON dc.entry_id = e.id
         JOIN cards c ON dc.card_id = c.id
-        JOIN tournament_entries te ON dc.entry_id = te.id
-        JOIN tournaments t ON te.tournament_id = t.id
-        JOIN archetypes a ON te.archetype_id = a.id
-        WHERE LOWER(a.name) = LOWER(:archetype_name)
-        AND t.date >= date('now', '-30 days')
+        WHERE t.date >= :cutoff
         AND dc.board = 'MAIN'
         GROUP BY c.id, c.name
-        ORDER BY decks_playing DESC
+        ORDER BY decks_playing DESC, c.name
         LIMIT 8
+    )
+    SELECT
+        a.id as archetype_id,
+        a.name as archetype_name,
+        f.name as format_name,
+        f.id as format_id,
+        (SELECT COUNT(*) FROM entries) as recent_entries,
+        (
+            SELECT COUNT(DISTINCT e.tournament_id)
+            FROM entries e
+            JOIN tournaments t ON e.tournament_id = t.id
+            WHERE t.date >= :cutoff
+        ) as tournaments_played,
+        ROUND(
+            CAST(totals.wins AS REAL) /
+            CAST((totals.wins + totals.losses) AS REAL) * 100, 1
+        ) as winrate_no_draws,
+        (
+            SELECT json_group_array(json_object(
+                'name', card_name,
+                'avg_copies', avg_copies,
+                'decks_playing', decks_playing
+            ))
+            FROM top_cards
+        ) as key_cards
+    FROM archetypes a
+    JOIN formats f ON a.format_id = f.id
+    CROSS JOIN totals
+    WHERE a.id = :archetype_id
     """
-    with engine.connect() as conn:
-        cards = conn.execute(text(cards_sql), {"archetype_name": found_name}).fetchall()
+)
+
+
+def compute_archetype_overview(engine: Engine, archetype_name: str) -> Dict[str, Any]:
+    """
+    Shared logic to compute archetype overview with recent performance and key cards.
+    Mirrors the previous MCP implementation but is reusable by other apps.
+    """
+    # Find archetype using fuzzy matching
+    arch_match = _find_archetype_fuzzy(engine, archetype_name)
+
+    arch_info = None
+    if arch_match:
+        # Query by the resolved id; no need to match the name again
+        with engine.connect() as conn:
+            arch_info = (
+                conn.execute(
+                    _OVERVIEW_SQL,
+                    {"archetype_id": arch_match["id"], "cutoff": _cutoff(30)},
+                )
+                .mappings()
+                .first()
+            )
+
+    # No row also covers an id that was deleted since it was resolved
+    if arch_info is None:
+        error = {
+            "error": f"Archetype '{archetype_name}' not found. ACTION REQUIRED: 1) Analyze deck cards/composition to identify intended archetype, 2) Call get_archetype_overview() on target archetype to get ID, 3) Call add_archetype_alias() to create mapping, 4) Retry original query. If no clear match found, inform user data unavailable."
+        }
+        # A close spelling is offered, not silently substituted
+        suggestion = _suggest_archetype(engine, archetype_name)
+        if suggestion:
+            error["did_you_mean"] = suggestion
+            error["error"] = f"{error['error']} Did you mean '{suggestion}'?"
+        return error
 
     return {
         "archetype_id": arch_info["archetype_id"],
@@ -180,17 +306,62 @@ def compute_archetype_overview(engine: Engine, archetype_name: str) -> Dict[str,
             "tournaments_played": arch_info["tournaments_played"] or 0,
             "winrate_percent": arch_info["winrate_no_draws"],
         },
-        "key_cards": [
-            {
-                "name": c.card_name,
-                "avg_copies": c.avg_copies,
-                "decks_playing": c.decks_playing,
-            }
-            for c in cards
-        ],
+        # json_group_array does not promise to keep the CTE's order (and
+        # aggregate ORDER BY needs SQLite 3.44), so sort the eight cards here
+        "key_cards": sorted(
+            orjson.loads(arch_info["key_cards"]),
+            key=lambda card: (-card["decks_playing"], card["name"]),
+        ),
     }
 
 
+_ARCHETYPE_CARDS_SQL = text(
+    """
+    WITH archetype_decks AS (
+        SELECT COUNT(*) as total_archetype_decks
+        FROM tournament_entries te
+        JOIN tournaments t ON te.tournament_id = t.id
+        JOIN archetypes a ON te.archetype_id = a.id
+        WHERE t.format_id = :format_id
+          AND t.date >= :start
+          AND t.date <= :end
+          AND LOWER(a.name) = :archetype_name
+    ),
+    card_stats AS (
+        SELECT 
+            c.name as card_name,
+            SUM(dc.count) as total_copies,
+            COUNT(*) as decks_playing,
+            ROUND(AVG(CAST(dc.count AS REAL)), 2) as avg_copies_per_deck
+        FROM deck_cards dc
+        JOIN cards c ON dc.card_id = c.id
+        JOIN tournament_entries te ON dc.entry_id = te.id
+        JOIN tournaments t ON te.tournament_id = t.id
+        JOIN archetypes a ON te.archetype_id = a.id
+        WHERE t.format_id = :format_id
+          AND t.date >= :start
+          AND t.date <= :end
+          AND LOWER(a.name) = :archetype_name
+          AND dc.board = :board
+        GROUP BY c.id, c.name
+    )
+    SELECT 
+        card_name,
+        total_copies,
+        decks_playing,
+        avg_copies_per_deck,
+        ROUND(
+            CAST(decks_playing AS REAL) / 
+            CAST((SELECT total_archetype_decks FROM archetype_decks) AS REAL) * 100, 2
+        ) as presence_percent
+    FROM card_stats
+    WHERE decks_playing > 0
+    ORDER BY decks_playing DESC, total_copies DESC
+    LIMIT :limit
+    """
+)
+
+
 def compute_archetype_cards(
     engine: Engine,
     format_id: str,
@@ -210,64 +381,21 @@ def compute_archetype_cards(
     if board not in ["MAIN", "SIDE"]:
         raise ValueError("board must be 'MAIN' or 'SIDE'")
 
-    sql = """
-        WITH archetype_decks AS (
-            SELECT COUNT(DISTINCT te.id) as total_archetype_decks
-            FROM tournament_entries te
-            JOIN tournaments t ON te.tournament_id = t.id
-            JOIN archetypes a ON te.archetype_id = a.id
-            WHERE t.format_id = :format_id
-              AND t.date >= :start
-              AND t.date <= :end
-              AND LOWER(a.name) = LOWER(:archetype_name)
-        ),
-        card_stats AS (
-            SELECT 
-                c.name as card_name,
-                SUM(dc.count) as total_copies,
-                COUNT(DISTINCT te.id) as decks_playing,
-                ROUND(AVG(CAST(dc.count AS REAL)), 2) as avg_copies_per_deck
-            FROM deck_cards dc
-            JOIN cards c ON dc.card_id = c.id
-            JOIN tournament_entries te ON dc.entry_id = te.id
-            JOIN tournaments t ON te.tournament_id = t.id
-            JOIN archetypes a ON te.archetype_id = a.id
-            WHERE t.format_id = :format_id
-              AND t.date >= :start
-              AND t.date <= :end
-              AND LOWER(a.name) = LOWER(:archetype_name)
-              AND dc.board = :board
-            GROUP BY c.id, c.name
-        )
-        SELECT 
-            card_name,
-            total_copies,
-            decks_playing,
-            avg_copies_per_deck,
-            ROUND(
-                CAST(decks_playing AS REAL) / 
-                CAST((SELECT total_archetype_decks FROM archetype_decks) AS REAL) * 100, 2
-            ) as presence_percent
-        FROM card_stats
-        WHERE decks_playing > 0
-        ORDER BY decks_playing DESC, total_copies DESC
-        LIMIT :limit
-    """
-
     with engine.connect() as conn:
-        rows = conn.execute(
-            text(sql),
-            {
-                "format_id": format_id,
-                "archetype_name": archetype_name,
-                "start": start,
-                "end": end,
-                "board": board,
-                "limit": limit,
-            },
-        ).fetchall()
-
-    data = [dict(r._mapping) for r in rows]
+        data = [
+            dict(r)
+            for r in conn.execute(
+                _ARCHETYPE_CARDS_SQL,
+                {
+                    "format_id": format_id,
+                    "archetype_name": archetype_name.lower(),
+                    "start": start,
+                    "end": end,
+                    "board": board,
+                    "limit": limit,
+                },
+            ).mappings()
+        ]
 
     return {
         "format_id": format_id,
@@ -279,6 +407,35 @@ def compute_archetype_cards(
     }
 
 
+_WINRATE_SQL = text(
+    """
+    SELECT
+      COALESCE(SUM(s.wins), 0) AS wins,
+      COALESCE(SUM(s.losses), 0) AS losses,
+      COALESCE(SUM(s.draws), 0) AS draws,
+      (SELECT name FROM archetypes WHERE id = :arch_id) AS archetype_name
+    FROM archetype_daily_stats s
+    WHERE s.archetype_id = :arch_id
+      AND s.date >= :start
+      AND s.date <= :end
+    """
+)
+
+_WINRATE_NO_MIRROR_SQL = text(
+    """
+    SELECT
+      COALESCE(SUM(s.wins - s.mirror_wins), 0) AS wins,
+      COALESCE(SUM(s.losses - s.mirror_losses), 0) AS losses,
+      COALESCE(SUM(s.draws - s.mirror_draws), 0) AS draws,
+      (SELECT name FROM archetypes WHERE id = :arch_id) AS archetype_name
+    FROM archetype_daily_stats s
+    WHERE s.archetype_id = :arch_id
+      AND s.date >= :start
+      AND s.date <= :end
+    """
+)
+
+
 def compute_archetype_winrate(
     engine: Engine,
     archetype_id: str,
@@ -288,28 +445,21 @@ def compute_archetype_winrate(
 ) -> Dict[str, Any]:
     """
     Compute wins/losses/draws and winrate (excluding draws) for a given archetype_id within [start, end].
+
+    Reads the archetype_daily_stats rollup, so the window is applied at day
+    granularity (both bounds inclusive).
     """
-    base_sql = """
-        SELECT
-          COALESCE(SUM(CASE WHEN m.result = 'WIN'  THEN 1 ELSE 0 END), 0) AS wins,
-          COALESCE(SUM(CASE WHEN m.result = 'LOSS' THEN 1 ELSE 0 END), 0) AS losses,
-          COALESCE(SUM(CASE WHEN m.result = 'DRAW' THEN 1 ELSE 0 END), 0) AS draws,
-          MAX(a.name) AS archetype_name
-        FROM matches m
-        JOIN tournament_entries e ON e.id = m.entry_id
-        JOIN tournaments t ON t.id = e.tournament_id
-        JOIN archetypes a ON e.archetype_id = a.id
-        WHERE e.archetype_id = :arch_id
-          AND t.date >= :start
-          AND t.date <= :end
-    """
-    sql = base_sql + (" AND m.mirror = 0" if exclude_mirror else "")
+    sql = _WINRATE_NO_MIRROR_SQL if exclude_mirror else _WINRATE_SQL
 
     with engine.connect() as conn:
         res = (
             conn.execute(
-                text(sql),
-                {"arch_id": archetype_id, "start": start, "end": end},
+                sql,
+                {
+                    "arch_id": archetype_id,
+                    "start": start.date().isoformat(),
+                    "end": end.date().isoformat(),
+                },
             )
             .mappings()
             .first()
@@ -339,6 +489,88 @@ def compute_archetype_winrate(
     }
 
 
+# One scan of the format's entries: archetype counts and format totals come
+# from the same rows. Match results are pre-aggregated per target entry so
+# entries are counted once without COUNT(DISTINCT). Rows are first grouped on
+# the raw t.date (streamed in idx_tournament_format_date order), then the
+# small per-date result is rolled up into weeks.
+_TRENDS_SQL = text(
+    """
+    WITH target AS (
+        SELECT id FROM archetypes WHERE LOWER(name) = :archetype_name
+    ),
+    results AS (
+        SELECT
+            m.entry_id,
+            COUNT(CASE WHEN m.result = 'WIN' THEN 1 END) as wins,
+            COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END) as losses,
+            COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END) as draws,
+            COUNT(*) as matches
+        FROM tournaments t
+        JOIN tournament_entries te ON t.id = te.tournament_id
+        JOIN matches m ON m.entry_id = te.id
+        WHERE t.format_id = :format_id
+        AND t.date >= :cutoff
+        AND te.archetype_id IN (SELECT id FROM target)
+        AND m.entry_id < m.opponent_entry_id
+        GROUP BY m.entry_id
+    ),
+    per_date AS (
+        SELECT
+            t.date as played_at,
+            SUM(COALESCE(te.archetype_id IN (SELECT id FROM target), 0)) as entries,
+            COUNT(*) as total_format_entries,
+            COALESCE(SUM(r.wins), 0) as wins,
+            COALESCE(SUM(r.losses), 0) as losses,
+            COALESCE(SUM(r.draws), 0) as draws,
+            -- an entry without matches still counts as one row, as before
+            SUM(
+                CASE WHEN te.archetype_id IN (SELECT id FROM target)
+                THEN COALESCE(r.matches, 1) ELSE 0 END
+            ) as total_matches
+        FROM tournaments t
+        JOIN tournament_entries te ON t.id = te.tournament_id
+        LEFT JOIN results r ON r.entry_id = te.id
+        WHERE t.format_id = :format_id
+        AND t.date >= :cutoff
+        GROUP BY t.date
+    ),
+    weeks AS (
+        SELECT
+            date(played_at, 'weekday 0', '-6 days') as week_start,
+            date(played_at, 'weekday 0') as week_end,
+            SUM(entries) as entries,
+            SUM(total_format_entries) as total_format_entries,
+            SUM(wins) as wins,
+            SUM(losses) as losses,
+            SUM(draws) as draws,
+            SUM(total_matches) as total_matches
+        FROM per_date
+        GROUP BY week_start, week_end
+    )
+    SELECT 
+        week_start,
+        week_end,
+        entries,
+        total_matches,
+        wins,
+        losses,
+        draws,
+        ROUND(
+            CAST(entries AS REAL) / 
+            CAST(total_format_entries AS REAL) * 100, 2
+        ) as presence_percent,
+        ROUND(
+            CAST(wins AS REAL) / 
+            CAST((wins + losses) AS REAL) * 100, 2
+        ) as winrate_no_draws
+    FROM weeks
+    WHERE entries > 0
+    ORDER BY week_start
+    """
+)
+
+
 def compute_archetype_trends(
     engine: Engine,
     format_id: str,
@@ -358,67 +590,18 @@ def compute_archetype_trends(
         Dict with weekly trend data: week_start, week_end, entries, total_matches, wins, losses, draws,
         presence_percent, winrate_no_draws
     """
-    # Build SQL with days_back substituted into SQLite date function
-    sql = """
-        WITH weeks AS (
-            SELECT 
-                date(t.date, 'weekday 0', '-6 days') as week_start,
-                date(t.date, 'weekday 0') as week_end,
-                COUNT(DISTINCT te.id) as entries,
-                COUNT(CASE WHEN m.result = 'WIN' THEN 1 END) as wins,
-                COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END) as losses,
-                COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END) as draws,
-                COUNT(*) as total_matches
-            FROM tournaments t
-            JOIN tournament_entries te ON t.id = te.tournament_id
-            JOIN archetypes a ON te.archetype_id = a.id
-            LEFT JOIN matches m ON te.id = m.entry_id AND m.entry_id < m.opponent_entry_id
-            WHERE t.format_id = :format_id
-            AND LOWER(a.name) = LOWER(:archetype_name)
-            AND t.date >= date('now', '-{} days')
-            GROUP BY week_start, week_end
-        ),
-        total_per_week AS (
-            SELECT 
-                date(t.date, 'weekday 0', '-6 days') as week_start,
-                COUNT(DISTINCT te.id) as total_format_entries
-            FROM tournaments t
-            JOIN tournament_entries te ON t.id = te.tournament_id
-            WHERE t.format_id = :format_id
-            AND t.date >= date('now', '-{} days')
-            GROUP BY week_start
-        )
-        SELECT 
-            w.week_start,
-            w.week_end,
-            w.entries,
-            w.total_matches,
-            w.wins,
-            w.losses,
-            w.draws,
-            ROUND(
-                CAST(w.entries AS REAL) / 
-                CAST(tpw.total_format_entries AS REAL) * 100, 2
-            ) as presence_percent,
-            ROUND(
-                CAST(w.wins AS REAL) / 
-                CAST((w.wins + w.losses) AS REAL) * 100, 2
-            ) as winrate_no_draws
-        FROM weeks w
-        LEFT JOIN total_per_week tpw ON w.week_start = tpw.week_start
-        ORDER BY w.week_start
-    """.format(days_back, days_back)
-
     with engine.connect() as conn:
-        rows = conn.execute(
-            text(sql),
-            {
-                "format_id": format_id,
-                "archetype_name": archetype_name,
-            },
-        ).fetchall()
-
-    data = [dict(r._mapping) for r in rows]
+        data = [
+            dict(r)
+            for r in conn.execute(
+                _TRENDS_SQL,
+                {
+                    "format_id": format_id,
+                    "archetype_name": archetype_name.lower(),
+                    "cutoff": _cutoff(days_back),
+                },
+            ).mappings()
+        ]
 
     return {
         "format_id": format_id,
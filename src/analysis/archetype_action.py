@@ -11,6 +11,7 @@ from ..mcp_server.utils import (
     ALLOWED_ALIAS_SQL,
 )
 from ..mcp_server.logging_config import mcp_logger
+from .archetype import clear_archetype_cache
 
 
 def add_archetype_alias(
@@ -142,6 +143,9 @@ def add_archetype_alias(
                     },
                 )
 
+        # New alias must be visible to the memoized archetype lookup
+        clear_archetype_cache()
+
         # Log successful operation
         mcp_logger.info(
             "Alias operation completed",
@@ -1,14 +1,217 @@
-from typing import Dict, Any, Optional
-from sqlalchemy import text
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Engine
 import requests
+from cachetools import TTLCache
+from cachetools.func import ttl_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..models.search import fts_match_query
+
+
+_CARD_COLUMNS = """
+    SELECT c.id, c.name, c.scryfall_oracle_id, c.colors, c.is_land,
+           s.code as set_code, s.name as set_name, c.first_printed_date
+"""
+
+# Fast path: exact name or name prefix as a range seek on idx_card_name_lower.
+# The exact name is the shortest prefix match, so it always comes first.
+_CARD_PREFIX_SQL = text(
+    _CARD_COLUMNS
+    + """
+    FROM cards c
+    LEFT JOIN sets s ON c.first_printed_set_id = s.id
+    WHERE LOWER(c.name) >= :name AND LOWER(c.name) < :name_end
+    ORDER BY LENGTH(c.name)
+    LIMIT 1
+    """
+)
+
+# Fallback: every query word as a name-word prefix, best FTS rank first
+_CARD_SEARCH_SQL = text(
+    _CARD_COLUMNS
+    + """
+    FROM cards_fts
+    JOIN cards c ON c.id = cards_fts.card_id
+    LEFT JOIN sets s ON c.first_printed_set_id = s.id
+    WHERE cards_fts MATCH :match
+    ORDER BY cards_fts.rank, LENGTH(c.name)
+    LIMIT 1
+    """
+)
+
+_CARD_BY_ORACLE_ID_SQL = text("SELECT id FROM cards WHERE scryfall_oracle_id = :oid")
+
+
+_SCRYFALL_NAMED_URL = "https://api.scryfall.com/cards/named"
+_SCRYFALL_COLLECTION_URL = "https://api.scryfall.com/cards/collection"
+# Maximum identifiers per /cards/collection request
+_SCRYFALL_COLLECTION_BATCH = 75
+# Scryfall asks clients to keep 50-100 ms between requests
+_SCRYFALL_MIN_INTERVAL_SECONDS = 0.1
+
+# Keep-alive session so repeat lookups skip the TCP/TLS handshake. Scryfall
+# requires User-Agent and Accept headers; transient 429/5xx are retried with
+# backoff (honoring Retry-After). POST is safe to retry: /cards/collection only reads.
+_scryfall_session = requests.Session()
+_scryfall_session.headers.update(
+    {"User-Agent": "metamage/1.0", "Accept": "application/json"}
+)
+_scryfall_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "POST"),
+        ),
+    ),
+)
+_scryfall_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scryfall")
+_scryfall_throttle = threading.Lock()
+_scryfall_last_request = 0.0
+
+_scryfall_cache: TTLCache = TTLCache(maxsize=4096, ttl=86400)
+_scryfall_cache_lock = threading.Lock()
+
+
+def _scryfall_request(method: str, url: str, **kwargs) -> requests.Response:
+    """Call the Scryfall API, spacing requests per Scryfall's rate limit."""
+    global _scryfall_last_request
+    with _scryfall_throttle:
+        wait = _SCRYFALL_MIN_INTERVAL_SECONDS - (
+            time.monotonic() - _scryfall_last_request
+        )
+        if wait > 0:
+            time.sleep(wait)
+        _scryfall_last_request = time.monotonic()
+    return _scryfall_session.request(method, url, timeout=10, **kwargs)
+
+
+def _fetch_scryfall(q: str) -> Dict[str, Any]:
+    """
+    Scryfall fuzzy lookup, cached for a day per lowercased query.
+
+    Each hit is also stored under the card's canonical name, so a later lookup
+    by the exact name (e.g. the local-DB re-query) is served from memory.
+    Raises on any failure so errors and misses are not cached.
+    """
+    key = q.lower()
+    with _scryfall_cache_lock:
+        card = _scryfall_cache.get(key)
+    if card is not None:
+        return card
+
+    resp = _scryfall_request("GET", _SCRYFALL_NAMED_URL, params={"fuzzy": q})
+    resp.raise_for_status()
+    card = resp.json()
+    _cache_scryfall_card(card, key)
+    return card
+
+
+def _cache_scryfall_card(card: Dict[str, Any], *keys: str) -> None:
+    """Store a Scryfall card under the given keys, its name and its face names."""
+    names = [card.get("name")] + [f.get("name") for f in card.get("card_faces", [])]
+    with _scryfall_cache_lock:
+        for key in list(keys) + [n.lower() for n in names if n]:
+            _scryfall_cache[key] = card
+
+
+def _fetch_scryfall_collection(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Exact-name Scryfall lookup for many cards, keyed by lowercased name.
+
+    Cached names are served from memory; the rest are POSTed to
+    /cards/collection in batches of 75, spaced at least 100 ms apart by the
+    shared Scryfall throttle. Names Scryfall does not know are absent from
+    the result. Raises on HTTP failure.
+    """
+    found: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    with _scryfall_cache_lock:
+        for name in names:
+            card = _scryfall_cache.get(name.lower())
+            if card is not None:
+                found[name.lower()] = card
+            else:
+                missing.append(name)
+
+    for i in range(0, len(missing), _SCRYFALL_COLLECTION_BATCH):
+        batch = missing[i : i + _SCRYFALL_COLLECTION_BATCH]
+        resp = _scryfall_request(
+            "POST",
+            _SCRYFALL_COLLECTION_URL,
+            json={"identifiers": [{"name": name} for name in batch]},
+        )
+        resp.raise_for_status()
+        for card in resp.json().get("data", []):
+            _cache_scryfall_card(card)
+        with _scryfall_cache_lock:
+            for name in batch:
+                card = _scryfall_cache.get(name.lower())
+                if card is not None:
+                    found[name.lower()] = card
+    return found
+
+
+def _card_payload(
+    db_card_id: Optional[str],
+    db_row: Optional[Mapping[str, Any]],
+    scryfall: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Unified card payload from Scryfall details and/or the local DB row."""
+    db_set_info = None
+    if db_row and db_row.get("set_code"):
+        db_set_info = {
+            "code": db_row.get("set_code"),
+            "name": db_row.get("set_name"),
+            "first_printed": str(db_row.get("first_printed_date"))
+            if db_row.get("first_printed_date")
+            else None,
+        }
+
+    if not scryfall:
+        # Scryfall failed but DB matched: partial info
+        return {
+            "card_id": db_card_id,
+            "name": db_row["name"],
+            "type": None,
+            "oracle_text": None,
+            "mana_cost": None,
+            "colors": db_row.get("colors"),
+            "is_land": db_row.get("is_land"),
+            "first_printed_set": db_set_info,
+        }
+
+    # Include local DB info if available
+    db_colors = db_row.get("colors") if db_row else None
+    db_is_land = db_row.get("is_land") if db_row else None
+    return {
+        "card_id": db_card_id,
+        "name": scryfall.get("name"),
+        "type": scryfall.get("type_line"),
+        "oracle_text": scryfall.get("oracle_text"),
+        "mana_cost": scryfall.get("mana_cost"),
+        "colors": db_colors or "".join(sorted(scryfall.get("colors", []))),
+        "is_land": db_is_land
+        if db_is_land is not None
+        else ("Land" in scryfall.get("type_line", "")),
+        "first_printed_set": db_set_info,
+    }
 
 
 def search_card(engine: Engine, query: str) -> Dict[str, Any]:
     """
     Shared card search logic.
 
-    - Search local DB by name (case-insensitive, partials allowed).
+    - Search local DB by name (case-insensitive): exact or prefix first, then word prefixes.
     - Always fetch canonical details from Scryfall fuzzy endpoint.
     - If Scryfall returns, try to map to local DB by oracle_id if needed.
     - Return a unified payload compatible with mcp_server.search_card.
@@ -20,112 +223,164 @@ def search_card(engine: Engine, query: str) -> Dict[str, Any]:
         raise ValueError("query must be a non-empty string")
 
     q = " ".join(query.strip().split())
-    pattern = f"%{q.lower()}%"
+    match = fts_match_query(q)
 
-    db_card_rows = []
+    # Start Scryfall on the raw query while the local search runs
+    scryfall_future = _scryfall_executor.submit(_fetch_scryfall, q)
+
+    db_card: Optional[Mapping[str, Any]] = None
     db_card_id: Optional[str] = None
 
-    # Local DB search
+    # Local DB search: exact/prefix range first, full-text index over names otherwise
     with engine.connect() as conn:
-        db_card_rows = conn.execute(
-            text(
-                """
-                SELECT c.id, c.name, c.scryfall_oracle_id, c.colors, c.is_land,
-                       s.code as set_code, s.name as set_name, c.first_printed_date
-                FROM cards c
-                LEFT JOIN sets s ON c.first_printed_set_id = s.id
-                WHERE LOWER(c.name) LIKE :pattern
-                ORDER BY CASE WHEN LOWER(c.name) = :exact_lower THEN 0 ELSE 1 END, LENGTH(c.name)
-                """
-            ),
-            {"pattern": pattern, "exact_lower": q.lower()},
-        ).fetchall()
-
-    if db_card_rows:
-        first = db_card_rows[0]._mapping
-        db_card_id = first["id"]
-        q = first["name"]
+        db_card = (
+            conn.execute(
+                _CARD_PREFIX_SQL,
+                {"name": q.lower(), "name_end": q.lower() + "\U0010ffff"},
+            )
+            .mappings()
+            .first()
+        )
+        if db_card is None and match:
+            db_card = (
+                conn.execute(_CARD_SEARCH_SQL, {"match": match}).mappings().first()
+            )
 
     # Scryfall fuzzy lookup
     scryfall = None
     try:
-        resp = requests.get(
-            "https://api.scryfall.com/cards/named",
-            params={"fuzzy": q},
-            timeout=10,
-        )
-        if resp.status_code == 200:
-            scryfall = resp.json()
+        scryfall = scryfall_future.result(timeout=10)
     except Exception:
         scryfall = None
 
+    if db_card:
+        db_card_id = db_card["id"]
+        # The local match is canonical; re-query if Scryfall resolved the raw
+        # query to a different card (or failed on it)
+        if not scryfall or scryfall.get("name", "").lower() != db_card["name"]:
+            try:
+                scryfall = _fetch_scryfall(db_card["name"])
+            except Exception:
+                scryfall = None
+
     if scryfall:
         # If we didn't have a DB id yet, try to map by oracle_id
         oracle_id = scryfall.get("oracle_id")
         if oracle_id and not db_card_id:
             with engine.connect() as conn:
                 row = conn.execute(
-                    text("SELECT id FROM cards WHERE scryfall_oracle_id = :oid"),
+                    _CARD_BY_ORACLE_ID_SQL,
                     {"oid": oracle_id},
                 ).first()
                 if row:
                     db_card_id = row[0]
 
-        # Include local DB info if available
-        db_colors = None
-        db_is_land = None
-        db_set_info = None
-        if db_card_rows:
-            first = db_card_rows[0]._mapping
-            db_colors = first.get("colors")
-            db_is_land = first.get("is_land")
-            if first.get("set_code"):
-                db_set_info = {
-                    "code": first.get("set_code"),
-                    "name": first.get("set_name"),
-                    "first_printed": str(first.get("first_printed_date"))
-                    if first.get("first_printed_date")
-                    else None,
-                }
+    # Fallback: if Scryfall failed but DB matched, return partial info
+    if scryfall or (db_card_id and db_card):
+        return _card_payload(db_card_id, db_card, scryfall)
 
-        return {
-            "card_id": db_card_id,
-            "name": scryfall.get("name"),
-            "type": scryfall.get("type_line"),
-            "oracle_text": scryfall.get("oracle_text"),
-            "mana_cost": scryfall.get("mana_cost"),
-            "colors": db_colors or "".join(sorted(scryfall.get("colors", []))),
-            "is_land": db_is_land
-            if db_is_land is not None
-            else ("Land" in scryfall.get("type_line", "")),
-            "first_printed_set": db_set_info,
-        }
+    raise ValueError("Card not found in local DB and Scryfall lookup failed")
 
-    # Fallback: if Scryfall failed but DB matched, return partial info
-    if db_card_id and db_card_rows:
-        first = db_card_rows[0]._mapping
-        db_set_info = None
-        if first.get("set_code"):
-            db_set_info = {
-                "code": first.get("set_code"),
-                "name": first.get("set_name"),
-                "first_printed": str(first.get("first_printed_date"))
-                if first.get("first_printed_date")
-                else None,
-            }
 
-        return {
-            "card_id": db_card_id,
-            "name": first["name"],
-            "type": None,
-            "oracle_text": None,
-            "mana_cost": None,
-            "colors": first.get("colors"),
-            "is_land": first.get("is_land"),
-            "first_printed_set": db_set_info,
+_CARDS_BY_NAMES_SQL = text(
+    _CARD_COLUMNS
+    + """
+    FROM cards c
+    LEFT JOIN sets s ON c.first_printed_set_id = s.id
+    WHERE LOWER(c.name) IN :names
+    """
+).bindparams(bindparam("names", expanding=True))
+
+
+def search_cards_bulk(engine: Engine, queries: List[str]) -> Dict[str, Any]:
+    """
+    Resolve many exact card names at once.
+
+    One local query resolves DB rows for all names while Scryfall's
+    /cards/collection endpoint is queried in batches of 75 (instead of one
+    /cards/named call per card). Local rows are matched to Scryfall cards by
+    oracle_id, then by name.
+
+    Returns dict with keys:
+      cards: one search_card-style payload per resolved query, in input order
+      not_found: queries found neither locally nor on Scryfall
+    """
+    names = [" ".join(q.strip().split()) for q in queries if isinstance(q, str)]
+    names = list(dict.fromkeys(n for n in names if n))
+    if not names:
+        raise ValueError("queries must contain at least one non-empty string")
+
+    scryfall_future = _scryfall_executor.submit(_fetch_scryfall_collection, names)
+
+    with engine.connect() as conn:
+        db_rows = {
+            row["name"].lower(): row
+            for row in conn.execute(
+                _CARDS_BY_NAMES_SQL, {"names": [n.lower() for n in names]}
+            ).mappings()
         }
 
-    raise ValueError("Card not found in local DB and Scryfall lookup failed")
+    try:
+        scryfall_cards = scryfall_future.result()
+    except Exception:
+        scryfall_cards = {}
+    db_by_oracle = {row["scryfall_oracle_id"]: row for row in db_rows.values()}
+
+    cards = []
+    not_found = []
+    for name in names:
+        scryfall = scryfall_cards.get(name.lower())
+        db_row = db_by_oracle.get(scryfall.get("oracle_id")) if scryfall else None
+        db_row = db_row or db_rows.get(name.lower())
+        if not scryfall and not db_row:
+            not_found.append(name)
+            continue
+        cards.append(_card_payload(db_row["id"] if db_row else None, db_row, scryfall))
+
+    return {"cards": cards, "not_found": not_found}
+
+
+_CARD_PRESENCE_SQL = text(
+    """
+    WITH total_decks AS (
+        SELECT SUM(s.entries) as total_format_decks
+        FROM archetype_daily_stats s
+        WHERE s.format_id = :format_id
+          AND s.date >= :start
+          AND s.date <= :end
+    ),
+    card_stats AS (
+        SELECT 
+            c.name as card_name,
+            SUM(s.total_copies) as total_copies,
+            SUM(s.decks_playing) as decks_playing,
+            ROUND(CAST(SUM(s.total_copies) AS REAL) / SUM(s.deck_rows), 2)
+                as avg_copies_per_deck
+        FROM card_daily_stats s
+        JOIN cards c ON s.card_id = c.id
+        WHERE s.format_id = :format_id
+          AND s.date >= :start
+          AND s.date <= :end
+          AND s.board = COALESCE(:board, 'ALL')
+          AND (NOT :exclude_lands OR NOT c.is_land)
+        GROUP BY c.id, c.name
+    )
+    SELECT 
+        cs.card_name,
+        cs.total_copies,
+        cs.decks_playing,
+        cs.avg_copies_per_deck,
+        ROUND(
+            CAST(cs.decks_playing AS REAL) / 
+            CAST(td.total_format_decks AS REAL) * 100, 2
+        ) as presence_percent
+    FROM card_stats cs
+    CROSS JOIN total_decks td
+    WHERE cs.decks_playing > 0
+    ORDER BY decks_playing DESC, total_copies DESC
+    LIMIT :limit
+    """
+)
 
 
 def compute_card_presence(
@@ -140,6 +395,9 @@ def compute_card_presence(
     """
     Compute top cards by presence within a format and date range.
 
+    Reads the card_daily_stats and archetype_daily_stats rollups, so the
+    window is applied at day granularity (both bounds inclusive).
+
     Args:
         engine: SQLAlchemy Engine
         format_id: Format UUID
@@ -155,66 +413,49 @@ def compute_card_presence(
     if board is not None and board not in ["MAIN", "SIDE"]:
         raise ValueError("board must be 'MAIN', 'SIDE', or None")
 
-    sql = """
-        WITH total_decks AS (
-            SELECT COUNT(DISTINCT te.id) as total_format_decks
-            FROM tournament_entries te
-            JOIN tournaments t ON te.tournament_id = t.id
-            WHERE t.format_id = :format_id
-              AND t.date >= :start
-              AND t.date <= :end
-        ),
-        card_stats AS (
-            SELECT 
-                c.name as card_name,
-                SUM(dc.count) as total_copies,
-                COUNT(DISTINCT te.id) as decks_playing,
-                ROUND(AVG(CAST(dc.count AS REAL)), 2) as avg_copies_per_deck
-            FROM deck_cards dc
-            JOIN cards c ON dc.card_id = c.id
-            JOIN tournament_entries te ON dc.entry_id = te.id
-            JOIN tournaments t ON te.tournament_id = t.id
-            WHERE t.format_id = :format_id
-              AND t.date >= :start
-              AND t.date <= :end
-              AND (:board IS NULL OR dc.board = :board)
-              AND (NOT :exclude_lands OR NOT c.is_land)
-            GROUP BY c.id, c.name
-        )
-        SELECT 
-            card_name,
-            total_copies,
-            decks_playing,
-            avg_copies_per_deck,
-            ROUND(
-                CAST(decks_playing AS REAL) / 
-                CAST((SELECT total_format_decks FROM total_decks) AS REAL) * 100, 2
-            ) as presence_percent
-        FROM card_stats
-        WHERE decks_playing > 0
-        ORDER BY decks_playing DESC, total_copies DESC
-        LIMIT :limit
-    """
-
-    with engine.connect() as conn:
-        rows = conn.execute(
-            text(sql),
-            {
-                "format_id": format_id,
-                "start": start,
-                "end": end,
-                "board": board,
-                "exclude_lands": exclude_lands,
-                "limit": limit,
-            },
-        ).fetchall()
-
-    data = [dict(r._mapping) for r in rows]
+    rows = _card_presence_rows(
+        engine,
+        format_id,
+        start.date().isoformat(),
+        end.date().isoformat(),
+        board,
+        exclude_lands,
+        limit,
+    )
 
     return {
         "format_id": format_id,
         "start_date": start.isoformat(),
         "end_date": end.isoformat(),
         "board": board,
-        "cards": data,
+        # Rows are flat, so copying each one keeps callers off the cached dicts
+        "cards": [dict(row) for row in rows],
     }
+
+
+# Keyed by day, like the rollup it reads; data changes only on ingest
+@ttl_cache(maxsize=256, ttl=300)
+def _card_presence_rows(
+    engine: Engine,
+    format_id: str,
+    start: str,
+    end: str,
+    board: Optional[str],
+    exclude_lands: bool,
+    limit: int,
+) -> Tuple[Dict[str, Any], ...]:
+    with engine.connect() as conn:
+        return tuple(
+            dict(r)
+            for r in conn.execute(
+                _CARD_PRESENCE_SQL,
+                {
+                    "format_id": format_id,
+                    "start": start,
+                    "end": end,
+                    "board": board,
+                    "exclude_lands": exclude_lands,
+                    "limit": limit,
+                },
+            ).mappings()
+        )
@@ -4,6 +4,28 @@ from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 
+_MATCHUP_SQL = text(
+    """
+    SELECT 
+        COUNT(CASE WHEN m.result = 'WIN' THEN 1 END) as arch1_wins,
+        COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END) as arch1_losses,
+        COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END) as draws,
+        COUNT(*) as total_matches
+    FROM matches m
+    JOIN tournament_entries te ON m.entry_id = te.id
+    JOIN tournament_entries opponent_te ON m.opponent_entry_id = opponent_te.id
+    JOIN tournaments t ON te.tournament_id = t.id
+    JOIN archetypes a ON te.archetype_id = a.id
+    JOIN archetypes opponent_a ON opponent_te.archetype_id = opponent_a.id
+    WHERE t.format_id = :format_id
+      AND t.date >= :start
+      AND t.date <= :end
+      AND LOWER(a.name) = :arch1_name
+      AND LOWER(opponent_a.name) = :arch2_name
+    """
+)
+
+
 def compute_matchup_winrate(
     engine: Engine,
     format_id: str,
@@ -31,33 +53,15 @@ def compute_matchup_winrate(
           - arch1_wins, arch1_losses, draws, total_matches, decisive_matches
           - winrate_no_draws (percentage, 2 decimals) or None if no decisive matches
     """
-    sql = """
-        SELECT 
-            COUNT(CASE WHEN m.result = 'WIN' THEN 1 END) as arch1_wins,
-            COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END) as arch1_losses,
-            COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END) as draws,
-            COUNT(*) as total_matches
-        FROM matches m
-        JOIN tournament_entries te ON m.entry_id = te.id
-        JOIN tournament_entries opponent_te ON m.opponent_entry_id = opponent_te.id
-        JOIN tournaments t ON te.tournament_id = t.id
-        JOIN archetypes a ON te.archetype_id = a.id
-        JOIN archetypes opponent_a ON opponent_te.archetype_id = opponent_a.id
-        WHERE t.format_id = :format_id
-          AND t.date >= :start
-          AND t.date <= :end
-          AND LOWER(a.name) = LOWER(:arch1_name)
-          AND LOWER(opponent_a.name) = LOWER(:arch2_name)
-    """
 
     with engine.connect() as conn:
         res = (
             conn.execute(
-                text(sql),
+                _MATCHUP_SQL,
                 {
                     "format_id": format_id,
-                    "arch1_name": archetype1_name,
-                    "arch2_name": archetype2_name,
+                    "arch1_name": archetype1_name.lower(),
+                    "arch2_name": archetype2_name.lower(),
                     "start": start,
                     "end": end,
                 },
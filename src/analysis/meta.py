@@ -1,9 +1,57 @@
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from cachetools.func import ttl_cache
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 
+_META_REPORT_SQL = text(
+    """
+    WITH archetype_stats AS (
+        SELECT
+            a.name as archetype_name,
+            SUM(s.matched_entries) as total_entries,
+            SUM(s.matched_tournaments) as tournaments_played,
+            SUM(s.wins) as total_wins,
+            SUM(s.losses) as total_losses,
+            SUM(s.draws) as total_draws,
+            SUM(s.wins + s.losses + s.draws) as total_matches
+        FROM archetype_daily_stats s
+        JOIN archetypes a ON s.archetype_id = a.id
+        WHERE s.format_id = :format_id
+          AND s.date >= :start
+          AND s.date <= :end
+        GROUP BY a.id, a.name
+    ),
+    format_totals AS (
+        SELECT SUM(total_matches) as total_format_matches
+        FROM archetype_stats
+    )
+    SELECT 
+        s.archetype_name,
+        s.total_entries,
+        s.tournaments_played,
+        s.total_wins,
+        s.total_losses,
+        s.total_draws,
+        s.total_matches,
+        ROUND(
+            CAST(s.total_matches AS REAL) / 
+            CAST(ft.total_format_matches AS REAL) * 100, 2
+        ) as presence_percent,
+        ROUND(
+            CAST(s.total_wins AS REAL) / 
+            CAST((s.total_wins + s.total_losses) AS REAL) * 100, 2
+        ) as winrate_percent_no_draws
+    FROM archetype_stats s
+    CROSS JOIN format_totals ft
+    WHERE s.total_matches > 0
+    ORDER BY s.total_matches DESC
+    LIMIT :limit
+    """
+)
+
+
 def compute_meta_report(
     engine: Engine,
     format_id: str,
@@ -16,6 +64,8 @@ def compute_meta_report(
 
     This is a pure function that executes a read-only SQL query using the provided SQLAlchemy engine.
     It is shared between the MCP server and the ChatGPT app to avoid duplicating logic.
+    Reads the archetype_daily_stats rollup, so the window is applied at day
+    granularity (both bounds inclusive).
 
     Args:
         engine: SQLAlchemy Engine (opened read-only in the server utils)
@@ -37,67 +87,30 @@ def compute_meta_report(
     if limit > 20:
         limit = 20
 
-    sql = """
-        WITH total_matches AS (
-            SELECT COUNT(*) as total_format_matches
-            FROM matches m
-            JOIN tournament_entries te ON m.entry_id = te.id
-            JOIN tournaments t ON te.tournament_id = t.id
-            WHERE t.format_id = :format_id
-              AND t.date >= :start
-              AND t.date <= :end
-        ),
-        archetype_stats AS (
-            SELECT
-                a.name as archetype_name,
-                COUNT(DISTINCT te.id) as total_entries,
-                COUNT(DISTINCT t.id) as tournaments_played,
-                COUNT(CASE WHEN m.result = 'WIN' THEN 1 END) as total_wins,
-                COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END) as total_losses,
-                COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END) as total_draws,
-                COUNT(*) as total_matches
-            FROM matches m
-            JOIN tournament_entries te ON m.entry_id = te.id
-            JOIN tournaments t ON te.tournament_id = t.id
-            JOIN archetypes a ON te.archetype_id = a.id
-            WHERE t.format_id = :format_id
-              AND t.date >= :start
-              AND t.date <= :end
-            GROUP BY a.id, a.name
-        )
-        SELECT 
-            archetype_name,
-            total_entries,
-            tournaments_played,
-            total_wins,
-            total_losses,
-            total_draws,
-            total_matches,
-            ROUND(
-                CAST(total_matches AS REAL) / 
-                CAST((SELECT total_format_matches FROM total_matches) AS REAL) * 100, 2
-            ) as presence_percent,
-            ROUND(
-                CAST(total_wins AS REAL) / 
-                CAST((total_wins + total_losses) AS REAL) * 100, 2
-            ) as winrate_percent_no_draws
-        FROM archetype_stats
-        WHERE total_matches > 0
-        ORDER BY total_matches DESC
-        LIMIT :limit
-    """
-
-    with engine.connect() as conn:
-        rows = conn.execute(
-            text(sql),
-            {"format_id": format_id, "start": start, "end": end, "limit": limit},
-        ).fetchall()
-
-    data = [dict(r._mapping) for r in rows]
+    rows = _meta_report_rows(
+        engine, format_id, start.date().isoformat(), end.date().isoformat(), limit
+    )
 
     return {
         "format_id": format_id,
         "start_date": start.isoformat(),
         "end_date": end.isoformat(),
-        "archetypes": data,
+        # Rows are flat, so copying each one keeps callers off the cached dicts
+        "archetypes": [dict(row) for row in rows],
     }
+
+
+# Keyed by day: "last 2 weeks" asked a minute apart hits the same entry, and
+# the rollup only changes on ingest
+@ttl_cache(maxsize=256, ttl=300)
+def _meta_report_rows(
+    engine: Engine, format_id: str, start: str, end: str, limit: int
+) -> Tuple[Dict[str, Any], ...]:
+    with engine.connect() as conn:
+        return tuple(
+            dict(r)
+            for r in conn.execute(
+                _META_REPORT_SQL,
+                {"format_id": format_id, "start": start, "end": end, "limit": limit},
+            ).mappings()
+        )
@@ -4,50 +4,81 @@ from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 
-def _find_player_fuzzy(engine: Engine, player_handle: str) -> Optional[Dict[str, Any]]:
-    """Find player using fuzzy matching on handle/normalized_handle."""
-    # Exact match on normalized_handle
-    exact_sql = """
-        SELECT id, handle, normalized_handle
-        FROM players
-        WHERE normalized_handle = LOWER(:player_handle)
+# Exact normalized handle > partial handle > partial normalized handle,
+# shortest handle first. Partial matches come from the trigram index.
+_PLAYER_FUZZY_SQL = text(
     """
-    with engine.connect() as conn:
-        result = conn.execute(text(exact_sql), {"player_handle": player_handle}).first()
-        if result:
-            return dict(result._mapping)
-
-    # Partial match on handle
-    partial_sql = """
-        SELECT id, handle, normalized_handle
-        FROM players
-        WHERE LOWER(handle) LIKE LOWER(:pattern)
-        ORDER BY LENGTH(handle)
-        LIMIT 1
-    """
-    with engine.connect() as conn:
-        pattern = f"%{player_handle}%"
-        result = conn.execute(text(partial_sql), {"pattern": pattern}).first()
-        if result:
-            return dict(result._mapping)
-
-    # Partial match on normalized_handle
-    normalized_partial_sql = """
-        SELECT id, handle, normalized_handle
-        FROM players
-        WHERE normalized_handle LIKE LOWER(:pattern)
-        ORDER BY LENGTH(handle)
-        LIMIT 1
+    SELECT p.id, p.handle, p.normalized_handle
+    FROM players p
+    WHERE p.normalized_handle = :player_handle
+       OR p.id IN (
+            SELECT player_id FROM players_fts WHERE handle LIKE :pattern
+            UNION
+            SELECT player_id FROM players_fts WHERE normalized_handle LIKE :pattern
+       )
+    ORDER BY
+        CASE
+            WHEN p.normalized_handle = :player_handle THEN 0
+            WHEN p.handle LIKE :pattern THEN 1
+            ELSE 2
+        END,
+        LENGTH(p.handle)
+    LIMIT 1
     """
+)
+
+
+def _find_player_fuzzy(engine: Engine, player_handle: str) -> Optional[Dict[str, Any]]:
+    """Find player using fuzzy matching on handle/normalized_handle."""
+    handle = player_handle.lower()
     with engine.connect() as conn:
-        pattern = f"%{player_handle.lower()}%"
         result = conn.execute(
-            text(normalized_partial_sql), {"pattern": pattern}
+            _PLAYER_FUZZY_SQL, {"player_handle": handle, "pattern": f"%{handle}%"}
         ).first()
-        if result:
-            return dict(result._mapping)
+    return dict(result._mapping) if result else None
+
 
-    return None
+# Aggregate recent performance
+_PLAYER_PERF_SQL = text(
+    """
+    SELECT
+        p.handle AS handle,
+        COUNT(DISTINCT te.id) AS total_entries,
+        COUNT(DISTINCT t.id) AS tournaments_played,
+        AVG(COALESCE(te.wins, 0) + COALESCE(te.losses, 0) + COALESCE(te.draws, 0)) AS avg_rounds,
+        MAX(t.date) AS last_tournament
+    FROM players p
+    LEFT JOIN tournament_entries te ON p.id = te.player_id
+    LEFT JOIN tournaments t ON te.tournament_id = t.id
+    WHERE p.id = :player_id
+      AND t.date >= :cutoff
+    GROUP BY p.id, p.handle
+    LIMIT 1
+    """
+)
+
+
+# Recent results (last 5)
+_PLAYER_RECENT_SQL = text(
+    """
+    SELECT
+        t.name AS tournament_name,
+        t.date AS date,
+        t.link AS tournament_link,
+        a.name AS archetype_name,
+        te.wins,
+        te.losses,
+        te.draws,
+        te.rank
+    FROM tournament_entries te
+    JOIN tournaments t ON te.tournament_id = t.id
+    JOIN archetypes a ON te.archetype_id = a.id
+    WHERE te.player_id = :player_id
+      AND t.date >= :cutoff
+    ORDER BY t.date DESC
+    LIMIT 5
+    """
+)
 
 
 def compute_player_profile(engine: Engine, player_id_or_handle: str) -> Dict[str, Any]:
@@ -67,30 +98,12 @@ def compute_player_profile(engine: Engine, player_id_or_handle: str) -> Dict[str
 
     cutoff = datetime.utcnow() - timedelta(days=90)
 
-    # Aggregate recent performance
-    perf_sql = """
-        SELECT
-            p.handle AS handle,
-            COUNT(DISTINCT te.id) AS total_entries,
-            COUNT(DISTINCT t.id) AS tournaments_played,
-            AVG(COALESCE(te.wins, 0) + COALESCE(te.losses, 0) + COALESCE(te.draws, 0)) AS avg_rounds,
-            MAX(t.date) AS last_tournament
-        FROM players p
-        LEFT JOIN tournament_entries te ON p.id = te.player_id
-        LEFT JOIN tournaments t ON te.tournament_id = t.id
-        WHERE p.id = :player_id
-          AND t.date >= :cutoff
-        GROUP BY p.id, p.handle
-        LIMIT 1
-    """
+    params = {"player_id": actual_player_id, "cutoff": cutoff}
+    results = []
     with engine.connect() as conn:
-        row = (
-            conn.execute(
-                text(perf_sql), {"player_id": actual_player_id, "cutoff": cutoff}
-            )
-            .mappings()
-            .first()
-        )
+        row = conn.execute(_PLAYER_PERF_SQL, params).mappings().first()
+        if row:
+            results = conn.execute(_PLAYER_RECENT_SQL, params).fetchall()
 
     if not row:
         return {"error": f"Player {actual_player_id} not found"}
@@ -104,30 +117,6 @@ def compute_player_profile(engine: Engine, player_id_or_handle: str) -> Dict[str
     last_tournament = row["last_tournament"]
     last_tournament_str = str(last_tournament) if last_tournament is not None else None
 
-    # Recent results (last 5)
-    recent_sql = """
-        SELECT
-            t.name AS tournament_name,
-            t.date AS date,
-            t.link AS tournament_link,
-            a.name AS archetype_name,
-            te.wins,
-            te.losses,
-            te.draws,
-            te.rank
-        FROM tournament_entries te
-        JOIN tournaments t ON te.tournament_id = t.id
-        JOIN archetypes a ON te.archetype_id = a.id
-        WHERE te.player_id = :player_id
-          AND t.date >= :cutoff
-        ORDER BY t.date DESC
-        LIMIT 5
-    """
-    with engine.connect() as conn:
-        results = conn.execute(
-            text(recent_sql), {"player_id": actual_player_id, "cutoff": cutoff}
-        ).fetchall()
-
     recent_results = [
         {
             "tournament_name": r.tournament_name,
@@ -4,6 +4,43 @@ from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 
+# Recent tournaments and the per-source breakdown share one filtered set;
+# rows are tagged so both come back in a single round-trip. Breakdown rows
+# carry the grand total and their share of it.
+_SOURCES_SQL = text(
+    """
+    WITH filtered AS (
+        SELECT DISTINCT t.id, t.name, t.date, t.link, t.source
+        FROM tournaments t
+        JOIN tournament_entries te ON te.tournament_id = t.id
+        LEFT JOIN archetypes a ON te.archetype_id = a.id
+        WHERE t.format_id = :format_id
+          AND t.date >= :start AND t.date <= :end
+          AND (:arch_name IS NULL OR LOWER(a.name) = :arch_name)
+    ),
+    recent AS (
+        SELECT DISTINCT name AS tournament_name, date, link, source
+        FROM filtered
+        ORDER BY date DESC
+        LIMIT :limit
+    )
+    SELECT
+        'row' AS tag, tournament_name, date, link, source,
+        NULL AS count, NULL AS total, NULL AS percent
+    FROM recent
+    UNION ALL
+    SELECT
+        'sum' AS tag, NULL, NULL, NULL, source,
+        COUNT(*) AS count,
+        SUM(COUNT(*)) OVER () AS total,
+        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 1) AS percent
+    FROM filtered
+    GROUP BY source
+    ORDER BY tag, date DESC
+    """
+)
+
+
 def compute_sources(
     engine: Engine,
     format_id: str,
@@ -22,62 +59,33 @@ def compute_sources(
     if limit > 10:
         limit = 10
 
-    tournaments_sql = """
-        SELECT DISTINCT
-            t.name AS tournament_name,
-            t.date,
-            t.link,
-            t.source
-        FROM tournaments t
-        JOIN tournament_entries te ON te.tournament_id = t.id
-        LEFT JOIN archetypes a ON te.archetype_id = a.id
-        WHERE t.format_id = :format_id
-          AND t.date >= :start AND t.date <= :end
-          AND (:arch_name IS NULL OR LOWER(a.name) = LOWER(:arch_name))
-        ORDER BY t.date DESC
-        LIMIT :limit
-    """
     params = {
         "format_id": format_id,
         "start": start,
         "end": end,
-        "arch_name": archetype_name,
+        "arch_name": archetype_name.lower() if archetype_name else None,
         "limit": limit,
     }
-    with engine.connect() as conn:
-        rows = conn.execute(text(tournaments_sql), params).fetchall()
-
-    sources_data = [dict(r._mapping) for r in rows]
-
-    # Calculate accurate source breakdown from ALL tournaments in date range
-    source_stats_sql = """
-        SELECT
-            t.source,
-            COUNT(DISTINCT t.id) as count
-        FROM tournaments t
-        JOIN tournament_entries te ON te.tournament_id = t.id
-        LEFT JOIN archetypes a ON te.archetype_id = a.id
-        WHERE t.format_id = :format_id
-          AND t.date >= :start AND t.date <= :end
-          AND (:arch_name IS NULL OR LOWER(a.name) = LOWER(:arch_name))
-        GROUP BY t.source
-    """
-
-    with engine.connect() as conn:
-        source_rows = conn.execute(text(source_stats_sql), params).fetchall()
-
+    sources_data = []
     source_counts = {}
-    total_tournaments = 0
-    for row in source_rows:
-        source = row.source
-        count = row.count
-        source_counts[source] = count
-        total_tournaments += count
-
     source_percentages = {}
-    if total_tournaments > 0:
-        for source, count in source_counts.items():
-            source_percentages[source] = round((count / total_tournaments) * 100, 1)
+    total_tournaments = 0
+    with engine.connect() as conn:
+        for r in conn.execute(_SOURCES_SQL, params):
+            if r.tag == "row":
+                sources_data.append(
+                    {
+                        "tournament_name": r.tournament_name,
+                        "date": r.date,
+                        "link": r.link,
+                        "source": r.source,
+                    }
+                )
+            else:
+                # Breakdown counts ALL tournaments in the date range
+                source_counts[r.source] = r.count
+                source_percentages[r.source] = r.percent
+                total_tournaments = r.total
 
     return {
         "format_id": format_id,
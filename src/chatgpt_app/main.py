@@ -2,46 +2,80 @@
 
 from __future__ import annotations
 
-from typing import List
+import asyncio
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
 
 import mcp.types as types
+from cachetools import TLRUCache
 from mcp.server.fastmcp import FastMCP
-import json
-
-try:
-    from src.analysis.meta import compute_meta_report
-    from src.analysis.archetype import (
-        compute_archetype_overview,
-        compute_archetype_cards,
-        compute_archetype_winrate,
-        compute_archetype_trends,
+import orjson
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+
+from src.analysis.meta import compute_meta_report
+from src.analysis.archetype import (
+    compute_archetype_overview,
+    compute_archetype_cards,
+    compute_archetype_winrate,
+    compute_archetype_trends,
+)
+from src.analysis.matchup import compute_matchup_winrate
+from src.analysis.card import (
+    search_card as analysis_search_card,
+    compute_card_presence,
+)
+from src.analysis.sources import compute_sources as analysis_compute_sources
+from src.analysis.player import compute_player_profile
+from src.models import Format
+
+from .query import execute_select_query
+from .utils import engine as db_engine, validate_date_range, get_session
+
+# Dates and unknown types go through str(), as json.dumps(default=str) did
+_DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(result: Any) -> str:
+    """Serialize a tool result for a TextContent payload."""
+    return orjson.dumps(result, default=str, option=_DUMPS_OPTIONS).decode()
+
+
+# Bound once: these run for every tool call
+_construct_server_result = types.ServerResult.model_construct
+_construct_call_tool_result = types.CallToolResult.model_construct
+_construct_text_content = types.TextContent.model_construct
+
+
+def _json_result(result: Any) -> types.ServerResult:
+    """
+    Wrap a JSON-serializable tool result in a ServerResult.
+
+    The envelope fields are fixed and the text is a str we just produced, so
+    the models are built with model_construct and skip pydantic validation.
+    """
+    return _construct_server_result(
+        _construct_call_tool_result(
+            content=[_construct_text_content(type="text", text=_dumps(result))]
+        )
     )
-    from src.analysis.matchup import compute_matchup_winrate
-    from src.analysis.card import (
-        search_card as analysis_search_card,
-        compute_card_presence,
+
+
+# Validated once; error results are shallow copies with only the text swapped
+_ERROR_TEMPLATE = types.CallToolResult(
+    content=[types.TextContent(type="text", text="")],
+    isError=True,
+)
+
+
+def _error_result(text: str) -> types.ServerResult:
+    """Build an isError tool result without re-running pydantic validation."""
+    content = _ERROR_TEMPLATE.content[0].model_copy(update={"text": text})
+    return _construct_server_result(
+        _ERROR_TEMPLATE.model_copy(update={"content": [content]})
     )
-    from src.analysis.sources import compute_sources as analysis_compute_sources
-    from src.analysis.player import compute_player_profile
-    from src.models import Format
-    from .utils import engine as db_engine, validate_date_range, get_session
-    from .query import execute_select_query
-except Exception:
-    compute_meta_report = None
-    compute_archetype_overview = None
-    compute_archetype_cards = None
-    compute_archetype_winrate = None
-    compute_archetype_trends = None
-    compute_matchup_winrate = None
-    analysis_search_card = None
-    compute_card_presence = None
-    analysis_compute_sources = None
-    compute_player_profile = None
-    Format = None
-    db_engine = None
-    validate_date_range = None
-    get_session = None
-    execute_select_query = None
+
 
 # Create the MCP server
 mcp = FastMCP(
@@ -50,14 +84,30 @@ mcp = FastMCP(
 )
 
 
-@mcp._mcp_server.list_tools()
-async def _list_tools() -> List[types.Tool]:
-    """List available tools."""
-    return [
-        types.Tool(
-            name="get-meta-report",
-            title="Metagame Report",
-            description="""Get top archetypes by match presence and winrate (excluding draws) over a date window. Use list-formats to get format_id. For 'recent meta', use last 30-60 days. Returns JSON with archetype stats including presence %, winrate %, matches, and entries.
+# Input-schema properties shared by several tools
+_FORMAT_ID_PROP = {"type": "string", "description": "Format UUID"}
+_ISO_DATE_PROP = {
+    "type": "string",
+    "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+}
+_ARCHETYPE_NAME_PROP = {
+    "type": "string",
+    "description": "Archetype name (case-insensitive)",
+}
+
+# Every tool is read-only; one shared annotations object for all of them
+_READ_ONLY_ANNOTATIONS = types.ToolAnnotations(
+    destructiveHint=False,
+    openWorldHint=False,
+    readOnlyHint=True,
+)
+
+# Tool definitions never change at runtime; build them once at import
+_TOOLS: List[types.Tool] = [
+    types.Tool(
+        name="get-meta-report",
+        title="Metagame Report",
+        description="""Get top archetypes by match presence and winrate (excluding draws) over a date window. Use list-formats to get format_id. For 'recent meta', use last 30-60 days. Returns JSON with archetype stats including presence %, winrate %, matches, and entries.
 
 Workflow Integration:
 - **Start here** for meta overview before drilling into specific archetypes
@@ -67,39 +117,35 @@ Workflow Integration:
 Related Tools: list-formats(), get-archetype-overview(), get-archetype-trends(), get-matchup-winrate(), get-sources()
 
 Example: Analyze current meta: 1) list-formats() → get Modern format_id, 2) get-meta-report(format_id, last 30 days) → see top decks, 3) get-matchup-winrate() between top 2 → understand matchup dynamics, 4) get-sources() → cite tournament evidence.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format_id": {
-                        "type": "string",
-                        "description": "Format UUID (get from list-formats)",
-                    },
-                    "start_date": {
-                        "type": "string",
-                        "description": "Start date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "End date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Max archetypes to return (default 15, max 20)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format_id": {
+                    "type": "string",
+                    "description": "Format UUID (get from list-formats)",
+                },
+                "start_date": {
+                    "type": "string",
+                    "description": "Start date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+                },
+                "end_date": {
+                    "type": "string",
+                    "description": "End date in ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max archetypes to return (default 15, max 20)",
                 },
-                "required": ["format_id", "start_date", "end_date"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
             },
-        ),
-        types.Tool(
-            name="get-archetype-overview",
-            title="Archetype Overview",
-            description="""Find an archetype by name using fuzzy matching and get its archetype_id (UUID) for use in query-database. Returns archetype_id, format_id, format_name, recent 30-day stats, and top 8 key cards.
+            "required": ["format_id", "start_date", "end_date"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="get-archetype-overview",
+        title="Archetype Overview",
+        description="""Find an archetype by name using fuzzy matching and get its archetype_id (UUID) for use in query-database. Returns archetype_id, format_id, format_name, recent 30-day stats, and top 8 key cards.
 
 Workflow Integration:
 - **Start here** to resolve archetype names and get archetype_id for custom queries
@@ -109,27 +155,23 @@ Workflow Integration:
 Related Tools: search-card() to get card_id, get-sources() for tournament links, get-meta-report() for broader context
 
 Example: To analyze a deck's card choices: 1) get-archetype-overview('Yawgmoth') → get archetype_id, 2) get-archetype-cards() → see what's played, 3) query-database() → compare performance with/without key cards""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "archetype_name": {
-                        "type": "string",
-                        "description": "Full or partial archetype name (fuzzy matching supported, e.g. 'Yawg' matches 'Yawgmoth')",
-                    }
-                },
-                "required": ["archetype_name"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "archetype_name": {
+                    "type": "string",
+                    "description": "Full or partial archetype name (fuzzy matching supported, e.g. 'Yawg' matches 'Yawgmoth')",
+                }
             },
-        ),
-        types.Tool(
-            name="get-archetype-trends",
-            title="Archetype Trends",
-            description="""Weekly presence and winrate (excluding draws) trends for an archetype over a trailing window. Shows how an archetype's meta share and performance evolved over time.
+            "required": ["archetype_name"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="get-archetype-trends",
+        title="Archetype Trends",
+        description="""Weekly presence and winrate (excluding draws) trends for an archetype over a trailing window. Shows how an archetype's meta share and performance evolved over time.
 
 Workflow Integration:
 - Use with get-meta-report() to correlate archetype trends with overall meta shifts
@@ -139,32 +181,25 @@ Workflow Integration:
 Related Tools: get-meta-report(), get-archetype-winrate(), get-format-meta-changes(), query-database(), get-sources()
 
 Example: Find a performance dip, then use get-sources() for that week to collect tournament links, and query-database() for card-level or matchup-level explanations.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format_id": {"type": "string", "description": "Format UUID"},
-                    "archetype_name": {
-                        "type": "string",
-                        "description": "Archetype name (case-insensitive)",
-                    },
-                    "days_back": {
-                        "type": "integer",
-                        "description": "Number of days to look back (default 30, 1-365)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format_id": _FORMAT_ID_PROP,
+                "archetype_name": _ARCHETYPE_NAME_PROP,
+                "days_back": {
+                    "type": "integer",
+                    "description": "Number of days to look back (default 30, 1-365)",
                 },
-                "required": ["format_id", "archetype_name"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
             },
-        ),
-        types.Tool(
-            name="query-database",
-            title="Run SELECT Query",
-            description="""Execute SELECT/CTE SQL queries against the MTG tournament database.
+            "required": ["format_id", "archetype_name"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="query-database",
+        title="Run SELECT Query",
+        description="""Execute SELECT/CTE SQL queries against the MTG tournament database.
 
 SCHEMA & RELATIONSHIPS:
 • tournaments → tournament_entries (via tournament_id)
@@ -194,31 +229,27 @@ DATE QUERIES:
 • Never use equality: t.date = '2025-01-01' (won't match)
 
 Do NOT include LIMIT in SQL; it's added automatically.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sql": {
-                        "type": "string",
-                        "description": "SELECT or WITH...SELECT query. Example for card in archetype: SELECT COUNT(*) FROM deck_cards dc JOIN tournament_entries te ON dc.entry_id = te.id JOIN tournaments t ON te.tournament_id = t.id WHERE dc.card_id = 'uuid-here' AND te.archetype_id = 'uuid-here' AND t.format_id = 'uuid-here' AND t.date >= '2025-01-01'",
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Max rows to return (default 1000, max 10000)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sql": {
+                    "type": "string",
+                    "description": "SELECT or WITH...SELECT query. Example for card in archetype: SELECT COUNT(*) FROM deck_cards dc JOIN tournament_entries te ON dc.entry_id = te.id JOIN tournaments t ON te.tournament_id = t.id WHERE dc.card_id = 'uuid-here' AND te.archetype_id = 'uuid-here' AND t.format_id = 'uuid-here' AND t.date >= '2025-01-01'",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max rows to return (default 1000, max 10000)",
                 },
-                "required": ["sql"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
             },
-        ),
-        types.Tool(
-            name="get-matchup-winrate",
-            title="Matchup Winrate",
-            description="""Compute head-to-head results and winrate (excluding draws) between two archetypes over a date window. Returns wins/losses/draws for archetype1 vs archetype2.
+            "required": ["sql"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="get-matchup-winrate",
+        title="Matchup Winrate",
+        description="""Compute head-to-head results and winrate (excluding draws) between two archetypes over a date window. Returns wins/losses/draws for archetype1 vs archetype2.
 
 Workflow Integration:
 - Use get-archetype-overview() first if you need help matching archetype names
@@ -228,46 +259,36 @@ Workflow Integration:
 Related Tools: get-archetype-overview(), get-meta-report(), get-archetype-trends(), query-database(), get-sources()
 
 Example: After seeing an archetype dominate the meta, check its matchups against top 5 archetypes to find weaknesses.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format_id": {"type": "string", "description": "Format UUID"},
-                    "archetype1_name": {
-                        "type": "string",
-                        "description": "First archetype name (case-insensitive)",
-                    },
-                    "archetype2_name": {
-                        "type": "string",
-                        "description": "Second archetype name (case-insensitive)",
-                    },
-                    "start_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format_id": _FORMAT_ID_PROP,
+                "archetype1_name": {
+                    "type": "string",
+                    "description": "First archetype name (case-insensitive)",
                 },
-                "required": [
-                    "format_id",
-                    "archetype1_name",
-                    "archetype2_name",
-                    "start_date",
-                    "end_date",
-                ],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
+                "archetype2_name": {
+                    "type": "string",
+                    "description": "Second archetype name (case-insensitive)",
+                },
+                "start_date": _ISO_DATE_PROP,
+                "end_date": _ISO_DATE_PROP,
             },
-        ),
-        types.Tool(
-            name="get-archetype-cards",
-            title="Archetype Cards",
-            description="""Get top cards in a specific archetype within a date window. Returns decks_playing, total_copies, avg_copies_per_deck, and presence % within the archetype.
+            "required": [
+                "format_id",
+                "archetype1_name",
+                "archetype2_name",
+                "start_date",
+                "end_date",
+            ],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="get-archetype-cards",
+        title="Archetype Cards",
+        description="""Get top cards in a specific archetype within a date window. Returns decks_playing, total_copies, avg_copies_per_deck, and presence % within the archetype.
 
 Workflow Integration:
 - Start with get-archetype-overview() to confirm the archetype and format
@@ -277,44 +298,31 @@ Workflow Integration:
 Related Tools: search-card(), get-card-presence(), get-archetype-overview(), query-database()
 
 Example: Check if a tech card is standard in an archetype: 1) cid = search-card('Psychic Frog').card_id, 2) get-archetype-cards(fmt, 'Domain Zoo', dates, 'MAIN'), 3) If card appears, use query-database() to compare W/L for entries with vs without that card_id.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format_id": {"type": "string", "description": "Format UUID"},
-                    "archetype_name": {
-                        "type": "string",
-                        "description": "Archetype name (case-insensitive)",
-                    },
-                    "start_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "board": {
-                        "type": "string",
-                        "description": "Card board: 'MAIN' or 'SIDE' (default MAIN)",
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Max cards (default 20)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format_id": _FORMAT_ID_PROP,
+                "archetype_name": _ARCHETYPE_NAME_PROP,
+                "start_date": _ISO_DATE_PROP,
+                "end_date": _ISO_DATE_PROP,
+                "board": {
+                    "type": "string",
+                    "description": "Card board: 'MAIN' or 'SIDE' (default MAIN)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max cards (default 20)",
                 },
-                "required": ["format_id", "archetype_name", "start_date", "end_date"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
             },
-        ),
-        types.Tool(
-            name="get-archetype-winrate",
-            title="Archetype Winrate",
-            description="""Compute wins/losses/draws and winrate (excluding draws) for a given archetype_id within a date window. Can optionally exclude mirror matches.
+            "required": ["format_id", "archetype_name", "start_date", "end_date"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="get-archetype-winrate",
+        title="Archetype Winrate",
+        description="""Compute wins/losses/draws and winrate (excluding draws) for a given archetype_id within a date window. Can optionally exclude mirror matches.
 
 Workflow Integration:
 - First use get-archetype-overview() to get the archetype_id
@@ -325,39 +333,29 @@ Workflow Integration:
 Related Tools: get-archetype-overview(), get-archetype-trends(), get-matchup-winrate(), query-database()
 
 Example: Analyze archetype performance: 1) get-archetype-overview('Yawgmoth') → get archetype_id, 2) get-archetype-winrate(archetype_id, dates, exclude_mirror=true) → see non-mirror winrate, 3) get-matchup-winrate() vs top 5 decks → identify good/bad matchups.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "archetype_id": {
-                        "type": "string",
-                        "description": "Archetype UUID (fetch via get-archetype-overview)",
-                    },
-                    "start_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "exclude_mirror": {
-                        "type": "boolean",
-                        "description": "Exclude mirror matches (default true)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "archetype_id": {
+                    "type": "string",
+                    "description": "Archetype UUID (fetch via get-archetype-overview)",
+                },
+                "start_date": _ISO_DATE_PROP,
+                "end_date": _ISO_DATE_PROP,
+                "exclude_mirror": {
+                    "type": "boolean",
+                    "description": "Exclude mirror matches (default true)",
                 },
-                "required": ["archetype_id", "start_date", "end_date"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
             },
-        ),
-        types.Tool(
-            name="search-card",
-            title="Search Card",
-            description="""Search a card by partial name and get its card_id (UUID) for use in query-database. Essential first step before querying card usage. Returns card_id, name, colors, oracle_id, and whether it's in the local tournament database.
+            "required": ["archetype_id", "start_date", "end_date"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="search-card",
+        title="Search Card",
+        description="""Search a card by partial name and get its card_id (UUID) for use in query-database. Essential first step before querying card usage. Returns card_id, name, colors, oracle_id, and whether it's in the local tournament database.
 
 Uses fuzzy matching via Scryfall if not found locally. Handles Universes Within variants (e.g., Marvel/OM1 versions).
 
@@ -369,27 +367,23 @@ Workflow Integration:
 Related Tools: get-card-presence(), get-archetype-cards(), query-database()
 
 Example: To analyze a card's impact: 1) search-card('Psychic Frog') → get card_id, 2) get-card-presence() → see overall adoption, 3) get-archetype-cards() → see which decks play it, 4) query-database() → compare performance of decks with/without it.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Partial or full card name",
-                    }
-                },
-                "required": ["query"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Partial or full card name",
+                }
             },
-        ),
-        types.Tool(
-            name="get-sources",
-            title="Recent Tournaments (for citations)",
-            description="""**FOR CITATION ONLY** - Return up to N recent tournaments (with links) for a format and optional archetype within a date window.
+            "required": ["query"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="get-sources",
+        title="Recent Tournaments (for citations)",
+        description="""**FOR CITATION ONLY** - Return up to N recent tournaments (with links) for a format and optional archetype within a date window.
 
 IMPORTANT: Returns tournaments ordered by DATE (most recent first), NOT by performance. Do NOT use this for finding "top performing" entries or performance analysis.
 
@@ -403,40 +397,30 @@ Workflow Integration:
 Related Tools: get-meta-report(), get-matchup-winrate(), get-archetype-trends(), get-tournament-results(), query-database()
 
 Example: After computing a winrate spike, call get-sources() over the same date window to list tournaments to cite.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format_id": {"type": "string", "description": "Format UUID"},
-                    "start_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "archetype_name": {
-                        "type": "string",
-                        "description": "Optional archetype name filter",
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Max tournaments (default 3, max 10)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format_id": _FORMAT_ID_PROP,
+                "start_date": _ISO_DATE_PROP,
+                "end_date": _ISO_DATE_PROP,
+                "archetype_name": {
+                    "type": "string",
+                    "description": "Optional archetype name filter",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max tournaments (default 3, max 10)",
                 },
-                "required": ["format_id", "start_date", "end_date"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
             },
-        ),
-        types.Tool(
-            name="get-card-presence",
-            title="Card Presence (Format)",
-            description="""Top cards by presence within a format and date range. Shows format-wide card adoption. Optionally filter by board (MAIN/SIDE) and exclude lands.
+            "required": ["format_id", "start_date", "end_date"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="get-card-presence",
+        title="Card Presence (Format)",
+        description="""Top cards by presence within a format and date range. Shows format-wide card adoption. Optionally filter by board (MAIN/SIDE) and exclude lands.
 
 Workflow Integration:
 - Start with search-card() to confirm exact card naming when needed
@@ -446,44 +430,34 @@ Workflow Integration:
 Related Tools: search-card(), get-archetype-cards(), get-meta-report(), query-database()
 
 Example: To test a hypothesis about a rising staple: 1) get-card-presence(fmt, dates) → see presence_percent, 2) cross-check in specific archetypes via get-archetype-cards(), 3) verify performance with query-database() joins on deck_cards.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format_id": {"type": "string", "description": "Format UUID"},
-                    "start_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "ISO date (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
-                    },
-                    "board": {
-                        "type": "string",
-                        "description": "Card board: 'MAIN' or 'SIDE' (default both)",
-                    },
-                    "exclude_lands": {
-                        "type": "boolean",
-                        "description": "Exclude land cards (default true)",
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Max cards (default 20)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format_id": _FORMAT_ID_PROP,
+                "start_date": _ISO_DATE_PROP,
+                "end_date": _ISO_DATE_PROP,
+                "board": {
+                    "type": "string",
+                    "description": "Card board: 'MAIN' or 'SIDE' (default both)",
+                },
+                "exclude_lands": {
+                    "type": "boolean",
+                    "description": "Exclude land cards (default true)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Max cards (default 20)",
                 },
-                "required": ["format_id", "start_date", "end_date"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
             },
-        ),
-        types.Tool(
-            name="get-player",
-            title="Get Player Profile",
-            description="""Get a player's recent (90-day) tournament activity and results by UUID or handle (fuzzy matching supported).
+            "required": ["format_id", "start_date", "end_date"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="get-player",
+        title="Get Player Profile",
+        description="""Get a player's recent (90-day) tournament activity and results by UUID or handle (fuzzy matching supported).
 
 Returns player_id, handle, recent tournaments, archetypes played, and performance stats.
 
@@ -495,779 +469,535 @@ Workflow Integration:
 Related Tools: get-archetype-overview(), get-tournament-results(), query-database()
 
 Example: Track a known player's recent success: 1) get-player('handle') → see their tournament results, 2) get-archetype-overview() on their main deck → understand archetype, 3) query-database() → analyze their specific deck tech choices.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "player_id_or_handle": {
-                        "type": "string",
-                        "description": "Player UUID or handle (fuzzy supported)",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "player_id_or_handle": {
+                    "type": "string",
+                    "description": "Player UUID or handle (fuzzy supported)",
                 },
-                "required": ["player_id_or_handle"],
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
             },
-        ),
-        types.Tool(
-            name="list-formats",
-            title="List Formats",
-            description="List all available Magic: The Gathering formats with their UUIDs and names. Use this to discover format_id values needed for other tools (get-meta-report, etc.). Returns JSON array of formats with 'id' and 'name' fields.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "additionalProperties": False,
-            },
-            annotations={
-                "destructiveHint": False,
-                "openWorldHint": False,
-                "readOnlyHint": True,
+            "required": ["player_id_or_handle"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="list-formats",
+        title="List Formats",
+        description="List all available Magic: The Gathering formats with their UUIDs and names. Use this to discover format_id values needed for other tools (get-meta-report, etc.). Returns JSON array of formats with 'id' and 'name' fields.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+    types.Tool(
+        name="batch-execute",
+        title="Batch Execute",
+        description="""Run up to 10 independent tool calls in one request. Operations run concurrently and results come back in the same order as a JSON array of {tool, isError, result}; a failing operation does not fail the others.
+
+Workflow Integration:
+- Use when the next few calls do not depend on each other's output, e.g. get-meta-report() + get-sources() for the same window, or get-archetype-winrate() for several archetypes
+- Calls that need an id from a previous result (list-formats() → format_id) still have to be made in sequence
+
+Related Tools: every other tool can be an operation except batch-execute itself
+
+Example: Compare the top 3 decks: batch-execute([get-archetype-winrate(A), get-archetype-winrate(B), get-archetype-winrate(C)]) → one round trip instead of three.""",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "operations": {
+                    "type": "array",
+                    "description": "Tool calls to run (1-10)",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tool": {
+                                "type": "string",
+                                "description": "Tool name, e.g. get-meta-report",
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Arguments for that tool",
+                            },
+                        },
+                        "required": ["tool"],
+                        "additionalProperties": False,
+                    },
+                },
+                "maxConcurrent": {
+                    "type": "integer",
+                    "description": "Max operations running at once (default and max 10)",
+                },
             },
-        ),
-    ]
+            "required": ["operations"],
+            "additionalProperties": False,
+        },
+        annotations=_READ_ONLY_ANNOTATIONS,
+    ),
+]
 
 
-async def _call_tool_request(req: types.CallToolRequest) -> types.ServerResult:
-    """Handle tool calls."""
-    if req.params.name == "get-meta-report":
-        if (
-            compute_meta_report is None
-            or db_engine is None
-            or validate_date_range is None
-        ):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: metagame tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        fmt = args.get("format_id")
-        start_str = args.get("start_date")
-        end_str = args.get("end_date")
-        lim = args.get("limit")
-        if not (fmt and start_str and end_str):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameters: format_id, start_date, end_date",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
+@mcp._mcp_server.list_tools()
+async def _list_tools() -> List[types.Tool]:
+    """List available tools."""
+    return _TOOLS
+
+
+def _handle_get_meta_report(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-meta-report."""
+    args = req.params.arguments or {}
+    fmt = args.get("format_id")
+    start_str = args.get("start_date")
+    end_str = args.get("end_date")
+    lim = args.get("limit")
+    try:
+        start_dt, end_dt = validate_date_range(start_str, end_str)
+        limit_val = lim if isinstance(lim, int) and lim > 0 else 15
+        result = compute_meta_report(db_engine, fmt, start_dt, end_dt, limit_val)
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_get_archetype_overview(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-archetype-overview."""
+    args = req.params.arguments or {}
+    arch = args.get("archetype_name")
+    try:
+        result = compute_archetype_overview(db_engine, arch.strip())
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_get_archetype_trends(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-archetype-trends."""
+    args = req.params.arguments or {}
+    fmt = args.get("format_id")
+    arch = args.get("archetype_name")
+    days = args.get("days_back", 30)
+    try:
         try:
-            start_dt, end_dt = validate_date_range(start_str, end_str)
-            limit_val = lim if isinstance(lim, int) and lim > 0 else 15
-            result = compute_meta_report(db_engine, fmt, start_dt, end_dt, limit_val)
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text=json.dumps(result, default=str),
-                        )
-                    ],
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text=f"Error: {e}",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-
-    if req.params.name == "get-archetype-overview":
-        if compute_archetype_overview is None or db_engine is None:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: archetype overview tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        arch = args.get("archetype_name")
-        if not isinstance(arch, str) or not arch.strip():
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameter: archetype_name",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
+            days_int = int(days)
+        except Exception:
+            days_int = 30
+        if days_int <= 0 or days_int > 365:
+            return _error_result("days_back must be between 1 and 365")
+        result = compute_archetype_trends(db_engine, fmt, arch.strip(), days_int)
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_query_database(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle query-database."""
+    args = req.params.arguments or {}
+    sql = args.get("sql")
+    lim = args.get("limit", 1000)
+    try:
+        result = execute_select_query(db_engine, sql, lim)
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_get_matchup_winrate(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-matchup-winrate."""
+    args = req.params.arguments or {}
+    fmt = args.get("format_id")
+    a1 = args.get("archetype1_name")
+    a2 = args.get("archetype2_name")
+    s = args.get("start_date")
+    e = args.get("end_date")
+    try:
+        start, end = validate_date_range(s, e)
+        result = compute_matchup_winrate(db_engine, fmt, a1, a2, start, end)
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_get_archetype_cards(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-archetype-cards."""
+    args = req.params.arguments or {}
+    fmt = args.get("format_id")
+    arch_name = args.get("archetype_name")
+    start_str = args.get("start_date")
+    end_str = args.get("end_date")
+    board = (args.get("board") or "MAIN").upper()
+    lim = args.get("limit", 20)
+    try:
+        start_dt, end_dt = validate_date_range(start_str, end_str)
+        if board not in ["MAIN", "SIDE"]:
+            return _error_result("board must be 'MAIN' or 'SIDE'")
+        limit_val = lim if isinstance(lim, int) and lim > 0 else 20
+        result = compute_archetype_cards(
+            db_engine, fmt, arch_name.strip(), start_dt, end_dt, board, limit_val
+        )
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_get_archetype_winrate(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-archetype-winrate."""
+    args = req.params.arguments or {}
+    arch_id = args.get("archetype_id")
+    start_str = args.get("start_date")
+    end_str = args.get("end_date")
+    exclude_mirror = args.get("exclude_mirror", True)
+    try:
+        start_dt, end_dt = validate_date_range(start_str, end_str)
+        result = compute_archetype_winrate(
+            db_engine, arch_id, start_dt, end_dt, bool(exclude_mirror)
+        )
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_search_card(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle search-card."""
+    args = req.params.arguments or {}
+    q = args.get("query")
+    try:
+        result = analysis_search_card(db_engine, q.strip())
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_get_sources(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-sources."""
+    args = req.params.arguments or {}
+    fmt = args.get("format_id")
+    start_str = args.get("start_date")
+    end_str = args.get("end_date")
+    arch_name = args.get("archetype_name")
+    lim = args.get("limit", 3)
+    try:
+        start_dt, end_dt = validate_date_range(start_str, end_str)
         try:
-            result = compute_archetype_overview(db_engine, arch.strip())
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text=json.dumps(result, default=str),
-                        )
-                    ],
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text=f"Error: {e}",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
+            limit_val = int(lim)
+        except Exception:
+            limit_val = 3
+        if limit_val <= 0:
+            limit_val = 3
+        if limit_val > 10:
+            limit_val = 10
+        result = analysis_compute_sources(
+            db_engine,
+            fmt,
+            start_dt,
+            end_dt,
+            arch_name if isinstance(arch_name, str) and arch_name.strip() else None,
+            limit_val,
+        )
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+def _handle_get_card_presence(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-card-presence."""
+    args = req.params.arguments or {}
+    fmt = args.get("format_id")
+    s = args.get("start_date")
+    e = args.get("end_date")
+    board = args.get("board")
+    exclude_lands = args.get("exclude_lands", True)
+    lim = args.get("limit", 20)
+    try:
+        start_dt, end_dt = validate_date_range(s, e)
+        board_norm = None
+        if isinstance(board, str) and board.strip():
+            board_norm = board.strip().upper()
+            if board_norm not in ["MAIN", "SIDE"]:
+                return _error_result("board must be 'MAIN' or 'SIDE' if provided")
+        limit_val = lim if isinstance(lim, int) and lim > 0 else 20
+        result = compute_card_presence(
+            db_engine,
+            fmt,
+            start_dt,
+            end_dt,
+            board_norm,
+            bool(exclude_lands),
+            limit_val,
+        )
+        return _json_result(result)
+    except Exception as ex:
+        return _error_result(f"Error: {ex}")
+
+
+def _handle_get_player(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle get-player."""
+    args = req.params.arguments or {}
+    ph = args.get("player_id_or_handle")
+    try:
+        result = compute_player_profile(db_engine, ph.strip())
+        return _json_result(result)
+    except Exception as ex:
+        return _error_result(f"Error: {ex}")
+
+
+def _handle_list_formats(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle list-formats."""
+    try:
+        with get_session() as session:
+            formats = session.query(Format).order_by(Format.name).all()
+
+        if not formats:
+            result = {"formats": [], "message": "No formats found in database"}
+        else:
+            format_list = [{"id": row.id, "name": row.name} for row in formats]
+            result = {"formats": format_list, "total_count": len(format_list)}
+
+        return _json_result(result)
+    except Exception as e:
+        return _error_result(f"Error: {e}")
+
+
+# Tool name -> handler, looked up once per call
+_TOOL_HANDLERS: Dict[str, Callable[[types.CallToolRequest], types.ServerResult]] = {
+    "get-meta-report": _handle_get_meta_report,
+    "get-archetype-overview": _handle_get_archetype_overview,
+    "get-archetype-trends": _handle_get_archetype_trends,
+    "query-database": _handle_query_database,
+    "get-matchup-winrate": _handle_get_matchup_winrate,
+    "get-archetype-cards": _handle_get_archetype_cards,
+    "get-archetype-winrate": _handle_get_archetype_winrate,
+    "search-card": _handle_search_card,
+    "get-sources": _handle_get_sources,
+    "get-card-presence": _handle_get_card_presence,
+    "get-player": _handle_get_player,
+    "list-formats": _handle_list_formats,
+}
+
+# Required arguments per tool, straight from each inputSchema. All of them are
+# strings, so one check covers every tool: present and not blank.
+_REQUIRED_ARGS: Dict[str, tuple] = {
+    tool.name: tuple(tool.inputSchema.get("required", ()))
+    for tool in _TOOLS
+    if tool.name in _TOOL_HANDLERS
+}
+# Shared, read-only: error results are never cached or stamped
+_MISSING_ARGS_RESULTS: Dict[str, types.ServerResult] = {
+    name: _error_result(
+        f"Missing required parameter{'s' if len(required) > 1 else ''}: "
+        + ", ".join(required)
+    )
+    for name, required in _REQUIRED_ARGS.items()
+    if required
+}
 
-    if req.params.name == "get-archetype-trends":
-        if compute_archetype_trends is None or db_engine is None:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: archetype trends tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        fmt = args.get("format_id")
-        arch = args.get("archetype_name")
-        days = args.get("days_back", 30)
-        if not (fmt and isinstance(arch, str) and arch.strip()):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameters: format_id, archetype_name",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            try:
-                days_int = int(days)
-            except Exception:
-                days_int = 30
-            if days_int <= 0 or days_int > 365:
-                return types.ServerResult(
-                    types.CallToolResult(
-                        content=[
-                            types.TextContent(
-                                type="text", text="days_back must be between 1 and 365"
-                            )
-                        ],
-                        isError=True,
-                    )
-                )
-            result = compute_archetype_trends(db_engine, fmt, arch.strip(), days_int)
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {e}")],
-                    isError=True,
-                )
-            )
 
-    if req.params.name == "query-database":
-        if db_engine is None or execute_select_query is None:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: query tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        sql = args.get("sql")
-        lim = args.get("limit", 1000)
-        if not isinstance(sql, str) or not sql.strip():
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text="Missing required parameter: sql"
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            result = execute_select_query(db_engine, sql, lim)
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {e}")],
-                    isError=True,
-                )
-            )
+# Bounded so scanners probing random names cannot grow it
+@lru_cache(maxsize=64)
+def _unknown_tool_result(name: str) -> types.ServerResult:
+    """Error result for a tool name that is not registered (shared, read-only)."""
+    return _error_result(f"Unknown tool: {name}")
 
-    if req.params.name == "get-matchup-winrate":
-        if (
-            db_engine is None
-            or validate_date_range is None
-            or compute_matchup_winrate is None
-        ):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: matchup tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        fmt = args.get("format_id")
-        a1 = args.get("archetype1_name")
-        a2 = args.get("archetype2_name")
-        s = args.get("start_date")
-        e = args.get("end_date")
-        if not (fmt and a1 and a2 and s and e):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameters: format_id, archetype1_name, archetype2_name, start_date, end_date",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            start, end = validate_date_range(s, e)
-            result = compute_matchup_winrate(db_engine, fmt, a1, a2, start, end)
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {e}")],
-                    isError=True,
-                )
-            )
 
-    if req.params.name == "get-archetype-cards":
-        if (
-            compute_archetype_cards is None
-            or db_engine is None
-            or validate_date_range is None
-        ):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: archetype cards tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        fmt = args.get("format_id")
-        arch_name = args.get("archetype_name")
-        start_str = args.get("start_date")
-        end_str = args.get("end_date")
-        board = (args.get("board") or "MAIN").upper()
-        lim = args.get("limit", 20)
-        if not (
-            fmt
-            and isinstance(arch_name, str)
-            and arch_name.strip()
-            and start_str
-            and end_str
-        ):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameters: format_id, archetype_name, start_date, end_date",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            start_dt, end_dt = validate_date_range(start_str, end_str)
-            if board not in ["MAIN", "SIDE"]:
-                return types.ServerResult(
-                    types.CallToolResult(
-                        content=[
-                            types.TextContent(
-                                type="text", text="board must be 'MAIN' or 'SIDE'"
-                            )
-                        ],
-                        isError=True,
-                    )
-                )
-            limit_val = lim if isinstance(lim, int) and lim > 0 else 20
-            result = compute_archetype_cards(
-                db_engine, fmt, arch_name.strip(), start_dt, end_dt, board, limit_val
-            )
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {e}")],
-                    isError=True,
-                )
-            )
+# Every analytics tool is read-only and deterministic for its arguments, and
+# the data only changes on ingest; models often repeat the exact same call in
+# a chat. Only touched on the event loop (handlers run in worker threads), so
+# no lock is needed.
+_TOOL_RESULT_TTL_SECONDS = 300
+# Formats only change when reference data is repopulated, not on ingest
+_TOOL_RESULT_TTL_OVERRIDES = {"list-formats": 3600}
 
-    if req.params.name == "get-archetype-winrate":
-        if (
-            compute_archetype_winrate is None
-            or db_engine is None
-            or validate_date_range is None
-        ):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: archetype winrate tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        arch_id = args.get("archetype_id")
-        start_str = args.get("start_date")
-        end_str = args.get("end_date")
-        exclude_mirror = args.get("exclude_mirror", True)
-        if not (arch_id and start_str and end_str):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameters: archetype_id, start_date, end_date",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            start_dt, end_dt = validate_date_range(start_str, end_str)
-            result = compute_archetype_winrate(
-                db_engine, arch_id, start_dt, end_dt, bool(exclude_mirror)
-            )
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {e}")],
-                    isError=True,
-                )
-            )
 
-    if req.params.name == "search-card":
-        if analysis_search_card is None or db_engine is None:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: search card tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        q = args.get("query")
-        if not isinstance(q, str) or not q.strip():
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text="Missing required parameter: query"
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            result = analysis_search_card(db_engine, q.strip())
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {e}")],
-                    isError=True,
-                )
-            )
+def _tool_result_expiry(key: tuple, value: types.ServerResult, now: float) -> float:
+    return now + _TOOL_RESULT_TTL_OVERRIDES.get(key[0], _TOOL_RESULT_TTL_SECONDS)
 
-    if req.params.name == "get-sources":
-        if (
-            analysis_compute_sources is None
-            or db_engine is None
-            or validate_date_range is None
-        ):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: sources tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        fmt = args.get("format_id")
-        start_str = args.get("start_date")
-        end_str = args.get("end_date")
-        arch_name = args.get("archetype_name")
-        lim = args.get("limit", 3)
-        if not (fmt and start_str and end_str):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameters: format_id, start_date, end_date",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            start_dt, end_dt = validate_date_range(start_str, end_str)
-            try:
-                limit_val = int(lim)
-            except Exception:
-                limit_val = 3
-            if limit_val <= 0:
-                limit_val = 3
-            if limit_val > 10:
-                limit_val = 10
-            result = analysis_compute_sources(
-                db_engine,
-                fmt,
-                start_dt,
-                end_dt,
-                arch_name if isinstance(arch_name, str) and arch_name.strip() else None,
-                limit_val,
-            )
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {e}")],
-                    isError=True,
-                )
-            )
 
-    if req.params.name == "get-card-presence":
-        if (
-            compute_card_presence is None
-            or db_engine is None
-            or validate_date_range is None
-        ):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: card presence tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        fmt = args.get("format_id")
-        s = args.get("start_date")
-        e = args.get("end_date")
-        board = args.get("board")
-        exclude_lands = args.get("exclude_lands", True)
-        lim = args.get("limit", 20)
-        if not (fmt and s and e):
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameters: format_id, start_date, end_date",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            start_dt, end_dt = validate_date_range(s, e)
-            board_norm = None
-            if isinstance(board, str) and board.strip():
-                board_norm = board.strip().upper()
-                if board_norm not in ["MAIN", "SIDE"]:
-                    return types.ServerResult(
-                        types.CallToolResult(
-                            content=[
-                                types.TextContent(
-                                    type="text",
-                                    text="board must be 'MAIN' or 'SIDE' if provided",
-                                )
-                            ],
-                            isError=True,
-                        )
-                    )
-            limit_val = lim if isinstance(lim, int) and lim > 0 else 20
-            result = compute_card_presence(
-                db_engine,
-                fmt,
-                start_dt,
-                end_dt,
-                board_norm,
-                bool(exclude_lands),
-                limit_val,
-            )
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as ex:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {ex}")],
-                    isError=True,
-                )
-            )
+_tool_result_cache: TLRUCache = TLRUCache(maxsize=1024, ttu=_tool_result_expiry)
 
-    if req.params.name == "get-player":
-        if compute_player_profile is None or db_engine is None:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: get-player unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        args = req.params.arguments or {}
-        ph = args.get("player_id_or_handle")
-        if not isinstance(ph, str) or not ph.strip():
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Missing required parameter: player_id_or_handle",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
-        try:
-            result = compute_player_profile(db_engine, ph.strip())
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text", text=json.dumps(result, default=str)
-                        )
-                    ]
-                )
-            )
-        except Exception as ex:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[types.TextContent(type="text", text=f"Error: {ex}")],
-                    isError=True,
-                )
-            )
+# Client-side caching hint in CallToolResult._meta. Analytics results are
+# stable for a given argument set; ad-hoc SQL output is one-off.
+_DEFAULT_CACHE_HINT_META = {"cache_hint": "ephemeral"}
+_CACHE_HINT_META = {"query-database": {"cache_hint": "no-cache"}}
+# Tools clients are told not to cache are not kept server-side either: an
+# ad-hoc SQL result can be thousands of rows and is rarely asked for twice
+_UNCACHED_TOOLS = frozenset(
+    name for name, meta in _CACHE_HINT_META.items() if meta["cache_hint"] == "no-cache"
+)
 
-    if req.params.name == "list-formats":
-        if Format is None or get_session is None:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text="Server misconfigured: list-formats tool unavailable",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
+
+async def _call_tool_request(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle tool calls, serving repeated identical calls from memory."""
+    if req.params.name == _BATCH_TOOL_NAME:
+        return await _handle_batch_execute(req)
+    handler = _TOOL_HANDLERS.get(req.params.name)
+    if handler is None:
+        return _unknown_tool_result(req.params.name)
+    args = req.params.arguments or {}
+    for arg in _REQUIRED_ARGS[req.params.name]:
+        value = args.get(arg)
+        if not isinstance(value, str) or not value.strip():
+            return _MISSING_ARGS_RESULTS[req.params.name]
+
+    key = None
+    result = None
+    if req.params.name not in _UNCACHED_TOOLS:
         try:
-            with get_session() as session:
-                formats = session.query(Format).order_by(Format.name).all()
-
-            if not formats:
-                result = {"formats": [], "message": "No formats found in database"}
-            else:
-                format_list = [{"id": row.id, "name": row.name} for row in formats]
-                result = {"formats": format_list, "total_count": len(format_list)}
-
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text=json.dumps(result, default=str),
-                        )
-                    ],
-                )
-            )
-        except Exception as e:
-            return types.ServerResult(
-                types.CallToolResult(
-                    content=[
-                        types.TextContent(
-                            type="text",
-                            text=f"Error: {e}",
-                        )
-                    ],
-                    isError=True,
-                )
-            )
+            # Key on the tool name too: different tools take the same arguments
+            key = (
+                req.params.name,
+                orjson.dumps(args, option=orjson.OPT_SORT_KEYS),
+            )
+        except orjson.JSONEncodeError as e:
+            # e.g. integers beyond 64 bits, which no tool accepts anyway
+            return _error_result(f"Error: invalid arguments: {e}")
+        result = _tool_result_cache.get(key)
+    if result is None:
+        # Handlers block on SQL (and Scryfall); keep the event loop free so
+        # concurrent calls overlap, up to the default executor's thread count
+        result = await asyncio.to_thread(handler, req)
+        # Errors may be transient (e.g. Scryfall down); don't pin them
+        if not result.root.isError:
+            # Stamp the hint on a copy; handlers may hand back shared results
+            hint = _CACHE_HINT_META.get(req.params.name, _DEFAULT_CACHE_HINT_META)
+            result = _construct_server_result(
+                result.root.model_copy(update={"meta": dict(hint)})
+            )
+            if key is not None:
+                _tool_result_cache[key] = result
+    return result
+
+
+# Bounded so one request cannot monopolize the worker threads or the DB pool
+_BATCH_MAX_CALLS = 10
+_BATCH_TOOL_NAME = "batch-execute"
+
+
+async def _gather_tool_calls(
+    calls: List[tuple], max_concurrent: int = _BATCH_MAX_CALLS
+) -> List[types.ServerResult]:
+    """
+    Run (name, arguments) tool calls concurrently, results in input order.
+
+    Each call goes through _call_tool_request, so it shares the result cache
+    and the worker-thread dispatch with single calls.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def run(name: Any, arguments: Any) -> types.ServerResult:
+        if not isinstance(name, str):
+            return _error_result("Each call needs a tool name")
+        if name == _BATCH_TOOL_NAME:
+            return _error_result(f"{_BATCH_TOOL_NAME} cannot be nested")
+        async with semaphore:
+            # Built from plain JSON we just checked; skip pydantic validation
+            return await _call_tool_request(
+                types.CallToolRequest.model_construct(
+                    method="tools/call",
+                    params=types.CallToolRequestParams.model_construct(
+                        name=name,
+                        arguments=arguments if isinstance(arguments, dict) else None,
+                    ),
+                )
+            )
+
+    results = await asyncio.gather(
+        *(run(name, arguments) for name, arguments in calls), return_exceptions=True
+    )
+    # One failing call must not take down the rest of the batch
+    return [
+        _error_result(f"Error: {r}") if isinstance(r, Exception) else r for r in results
+    ]
 
-    # Unknown tool
-    return types.ServerResult(
-        types.CallToolResult(
-            content=[
-                types.TextContent(
-                    type="text",
-                    text=f"Unknown tool: {req.params.name}",
-                )
-            ],
-            isError=True,
+
+async def _handle_batch_execute(req: types.CallToolRequest) -> types.ServerResult:
+    """Handle batch-execute."""
+    args = req.params.arguments or {}
+    operations = args.get("operations")
+    if not isinstance(operations, list) or not 0 < len(operations) <= _BATCH_MAX_CALLS:
+        return _error_result(
+            f"operations must be a list of 1 to {_BATCH_MAX_CALLS} tool calls"
         )
-    )
+    max_concurrent = args.get("maxConcurrent")
+    if not isinstance(max_concurrent, int) or max_concurrent <= 0:
+        max_concurrent = _BATCH_MAX_CALLS
+
+    calls = [
+        (op.get("tool"), op.get("arguments")) if isinstance(op, dict) else (None, None)
+        for op in operations
+    ]
+    results = await _gather_tool_calls(calls, min(max_concurrent, _BATCH_MAX_CALLS))
+
+    payload = []
+    for (name, _), result in zip(calls, results):
+        text = result.root.content[0].text
+        payload.append(
+            {
+                "tool": name,
+                "isError": result.root.isError,
+                # Successful tool output is JSON text; nest it as JSON
+                "result": text if result.root.isError else orjson.Fragment(text),
+            }
+        )
+    return _json_result(payload)
 
 
 # Register the tool handler
 mcp._mcp_server.request_handlers[types.CallToolRequest] = _call_tool_request
 
+
 # Create the FastAPI app
 app = mcp.streamable_http_app()
 
-# Add CORS middleware
-try:
-    from starlette.middleware.cors import CORSMiddleware
+# Compress JSON responses (tools/list, large query results); SSE streams are
+# excluded by Starlette
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Add CORS middleware; a fixed allowlist keeps the allow-origin header
+# cacheable upstream. Comma-separated override via CORS_ORIGINS.
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=os.getenv(
+        "CORS_ORIGINS", "https://chatgpt.com,https://chat.openai.com"
+    ).split(","),
+    allow_methods=["*"],
+    allow_headers=["*"],
+    allow_credentials=False,
+)
 
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_methods=["*"],
-        allow_headers=["*"],
-        allow_credentials=False,
-    )
-except Exception:
-    pass
+# Materialize the middleware chain now rather than on the first request
+app.middleware_stack = app.build_middleware_stack()
 
 
 if __name__ == "__main__":
+    import sys
+
     import uvicorn
 
-    print("Starting MCP server on http://0.0.0.0:8000")
-    print("Endpoints:")
-    print("  - GET  /mcp (SSE stream)")
-    print("  - POST /mcp/messages?sessionId=<id>")
-    uvicorn.run("src.chatgpt_app.main:app", host="0.0.0.0", port=8000)
+    dev = os.getenv("DEV") == "1"
+    # One worker by default. Extra workers are opt-in via WORKERS: each has its
+    # own DB pool (up to 32 SQLite connections, each with its own page cache
+    # and mmap) and its own in-process caches, so memory grows and cache hit
+    # rates drop with every worker. stateless_http=True lets requests land on
+    # any of them.
+    workers = 1 if dev else int(os.getenv("WORKERS", "1"))
+
+    sys.stdout.write(
+        f"Starting MCP server on http://0.0.0.0:8000 ({workers} worker(s))\n"
+        "Endpoints:\n"
+        "  - GET  /mcp (SSE stream)\n"
+        "  - POST /mcp/messages?sessionId=<id>\n"
+    )
+    sys.stdout.flush()
+    uvicorn.run(
+        "src.chatgpt_app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        # File-watch reloading is for local development only
+        reload=dev,
+        workers=workers,
+        # uvloop and httptools when installed (uvicorn[standard]), asyncio/h11 otherwise
+        loop="auto",
+        http="auto",
+    )
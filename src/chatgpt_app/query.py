@@ -1,8 +1,31 @@
 """SQL query execution utilities for ChatGPT app."""
 
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+import orjson
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import TextClause
+
+
+_FORBIDDEN_KEYWORDS = (
+    "insert",
+    "update",
+    "delete",
+    "alter",
+    "drop",
+    "create",
+    "attach",
+    "detach",
+    "pragma",
+    "begin",
+    "commit",
+    "rollback",
+    "vacuum",
+    "reindex",
+    "replace",
+)
 
 
 def validate_select_only(sql: str) -> str:
@@ -12,30 +35,19 @@ def validate_select_only(sql: str) -> str:
     """
     if not isinstance(sql, str):
         raise ValueError("SQL must be a string")
+    return _validate_select_sql(sql)
+
+
+# Agents re-issue the same SQL across calls; rejections raise and are not cached
+@lru_cache(maxsize=512)
+def _validate_select_sql(sql: str) -> str:
     s = sql.strip()
     if s.endswith(";"):
         s = s[:-1].strip()
     lowered = s.lower()
     if not (lowered.startswith("select") or lowered.startswith("with")):
         raise ValueError("Only SELECT queries are allowed (including WITH ... SELECT).")
-    forbidden = [
-        "insert",
-        "update",
-        "delete",
-        "alter",
-        "drop",
-        "create",
-        "attach",
-        "detach",
-        "pragma",
-        "begin",
-        "commit",
-        "rollback",
-        "vacuum",
-        "reindex",
-        "replace",
-    ]
-    if any(f in lowered for f in forbidden):
+    if any(f in lowered for f in _FORBIDDEN_KEYWORDS):
         raise ValueError(
             "Query contains forbidden keywords; only read-only SELECT is allowed."
         )
@@ -44,6 +56,19 @@ def validate_select_only(sql: str) -> str:
     return s
 
 
+@lru_cache(maxsize=512)
+def _select_statement(s: str) -> Tuple[TextClause, bool]:
+    """
+    text() statement for validated SQL `s`, with a LIMIT bind appended unless
+    the query has its own. Returns (statement, has_limit).
+
+    Memoized so agents re-issuing the same query reuse one TextClause (and its
+    compiled form in SQLAlchemy's statement cache).
+    """
+    has_limit = " limit " in s.lower()
+    return text(s if has_limit else f"{s} LIMIT :_limit"), has_limit
+
+
 def execute_select_query(engine: Engine, sql: str, limit: int = 1000) -> Dict[str, Any]:
     """
     Execute a validated SELECT query with automatic LIMIT injection.
@@ -54,7 +79,8 @@ def execute_select_query(engine: Engine, sql: str, limit: int = 1000) -> Dict[st
         limit: Max rows to return (default 1000, max 10000)
 
     Returns:
-        Dict with rowcount, rows, and documentation
+        Dict with rowcount, rows, and documentation. Rows are already
+        serialized (an orjson.Fragment holding the JSON array).
     """
     # Validate the SQL
     s = validate_select_only(sql)
@@ -69,21 +95,20 @@ def execute_select_query(engine: Engine, sql: str, limit: int = 1000) -> Dict[st
     if limit_val > 10000:
         limit_val = 10000
 
-    # Check if query already has LIMIT
-    has_limit = " limit " in s.lower()
-    stmt = text(s if has_limit else f"{s} LIMIT :_limit")
+    stmt, has_limit = _select_statement(s)
     params = {} if has_limit else {"_limit": limit_val}
 
-    # Execute query
+    # Serialize each row as it is fetched so up to 10k row dicts are never
+    # held at once; unknown types (e.g. BLOBs) go through str()
     with engine.connect() as conn:
-        rows = conn.execute(stmt, params).fetchall()
-
-    # Convert to dict
-    data = [dict(r._mapping) for r in rows]
+        rows = [
+            orjson.dumps(dict(r), default=str)
+            for r in conn.execute(stmt, params).mappings()
+        ]
 
     return {
-        "rowcount": len(data),
-        "rows": data,
+        "rowcount": len(rows),
+        "rows": orjson.Fragment(b"[" + b",".join(rows) + b"]"),
         "docs": [
             "SQLite has no roles; enforce read-only by opening in mode=ro and PRAGMA query_only=ON.",
             "Block non-SELECT in application layer.",
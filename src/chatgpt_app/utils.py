@@ -2,6 +2,8 @@
 
 from datetime import datetime
 from contextlib import contextmanager
+from functools import lru_cache
+from sqlalchemy import event
 from src.models import get_engine, get_session_factory
 
 # Create engine for database access
@@ -23,10 +25,20 @@ def get_session():
         session.close()
 
 
+@event.listens_for(engine, "connect")
+def _set_ro_pragmas(dbapi_connection, connection_record):
+    cur = dbapi_connection.cursor()
+    cur.execute("PRAGMA query_only=ON")
+    cur.close()
+
+
+# Models reuse the same few windows across calls; datetimes are immutable
+@lru_cache(maxsize=2048)
 def validate_date_range(start_date: str, end_date: str) -> tuple[datetime, datetime]:
     """
     Validate and parse ISO date strings, ensuring end_date >= start_date.
-    Returns (start, end) as datetime objects.
+    Returns (start, end) as datetime objects. Invalid ranges raise and are
+    not cached.
     """
     try:
         start = datetime.fromisoformat(start_date)
@@ -6,6 +6,7 @@ from sqlalchemy import func, inspect, text
 
 from ..ops_model.base import get_ops_session_factory
 from ..ops_model.chat_models import ChatSession, ChatMessage, ToolCall, ToolResult
+from ..ops_model.complexity import tool_call_complexity
 
 
 class ChatLogger:
@@ -160,6 +161,7 @@ class ChatLogger:
                 tool_name=tool_name,
                 input_params=input_params,
                 call_id=call_id,
+                complexity=tool_call_complexity(tool_name, input_params),
             )
             session.add(tool_call)
             session.commit()
@@ -28,6 +28,11 @@ SCRYFALL_HEADERS = {
 # Scryfall asks for 50–100ms between requests; use 100ms to stay safely under cap.
 SCRYFALL_REQUEST_DELAY = 0.1
 
+# One keep-alive session for the whole ingestion run: thousands of lookups
+# reuse the same TLS connection instead of handshaking per card.
+_scryfall_session = requests.Session()
+_scryfall_session.headers.update(SCRYFALL_HEADERS)
+
 
 class CardCache:
     """In-memory cache for cards to avoid duplicate database lookups and API calls."""
@@ -93,9 +98,7 @@ def _scryfall_get(
         # Pace requests before sending so we never burst.
         time.sleep(SCRYFALL_REQUEST_DELAY)
         try:
-            response = requests.get(
-                url, params=params, headers=SCRYFALL_HEADERS, timeout=10
-            )
+            response = _scryfall_session.get(url, params=params, timeout=10)
         except requests.RequestException as e:
             print(f"  ⚠️ Network error fetching {context}: {e}")
             return None
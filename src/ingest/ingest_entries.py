@@ -8,9 +8,10 @@ Creates/links:
 - tournaments
 - tournament_entries (wins/losses/draws left at defaults)
 - deck_cards
+and refreshes the daily stats rollups for every day it touched.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, List, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 
@@ -35,6 +36,7 @@ from ingest.ingest_players import normalize_player_handle
 from ingest.ingest_archetypes import normalize_archetype_name
 from ingest.ingest_cards import normalize_card_name, CardCache, fetch_scryfall_data
 from ingest.rounds_finder import find_rounds_file, TournamentSearchCriteria
+from ingest.refresh_rollups import refresh_all_rollups
 
 
 def parse_iso_datetime(dt_str: str) -> datetime:
@@ -292,6 +294,8 @@ def ingest_entries(session: Session, entries: List[Dict[str, Any]], format_id: s
     Ingest tournaments, tournament entries, and deck cards based on JSON data.
     - Does not ingest matches.
     - Leaves wins/losses/draws at their default values.
+    - Refreshes the daily stats rollups from the earliest tournament day it
+      touched; the caller commits.
     """
     print("🧾 Processing tournaments, entries, deck cards and matches...")
 
@@ -363,6 +367,9 @@ def ingest_entries(session: Session, entries: List[Dict[str, Any]], format_id: s
     # Key: tournament_id, Value: rounds_data
     tournaments_with_embedded_rounds: Dict[str, Any] = {}
 
+    # Earliest tournament day whose entries changed; rollups are rebuilt from there
+    rollups_since: Optional[date] = None
+
     for i, e in enumerate(filtered_entries, start=1):
         stats["entries_seen"] += 1
 
@@ -562,6 +569,9 @@ def ingest_entries(session: Session, entries: List[Dict[str, Any]], format_id: s
             archetype_id=archetype.id,
             decklist_url=anchor,
         )
+        if created or archetype_changed:
+            if rollups_since is None or t_date.date() < rollups_since:
+                rollups_since = t_date.date()
         if created:
             stats["entries_created"] += 1
             # Mark tournament for matches/standings finalization
@@ -628,6 +638,11 @@ def ingest_entries(session: Session, entries: List[Dict[str, Any]], format_id: s
             "file_missing", 0
         ) + mstats.get("file_ambiguous", 0)
 
+    # Keep the rollups in step with the rows written above (caller commits)
+    if rollups_since is not None:
+        print(f"📈 Refreshing daily stats rollups from {rollups_since}...")
+        refresh_all_rollups(session, rollups_since)
+
     print("\n📊 Entries Ingestion Summary:")
     print(f"  🧾 Entries seen: {stats['entries_seen']}")
     print(f"  🚮 Entries filtered (existing tournaments): {stats['entries_filtered']}")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Rebuild the derived rollup tables used by the analysis queries.
+
+archetype_daily_stats holds one row per (archetype, day) with entry and
+match counts, so winrate windows sum a handful of rows instead of joining
+matches -> tournament_entries -> tournaments on every call.
+
+card_daily_stats holds one row per (card, day, format, board) with deck and
+copy counts; board 'ALL' counts decks playing the card in either board.
+
+Usage:
+    python refresh_rollups.py                     # Full rebuild
+    python refresh_rollups.py --since 2025-01-01  # Only days on/after this date
+"""
+
+import sys
+import argparse
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import Base, get_engine, get_session_factory
+
+
+DELETE_ARCHETYPE_DAILY_STATS_SQL = text(
+    """
+    DELETE FROM archetype_daily_stats
+    WHERE :since IS NULL OR date >= :since
+    """
+)
+
+INSERT_ARCHETYPE_DAILY_STATS_SQL = text(
+    """
+    INSERT INTO archetype_daily_stats (
+        archetype_id, date, format_id, entries, tournaments,
+        matched_entries, matched_tournaments,
+        wins, losses, draws, mirror_wins, mirror_losses, mirror_draws
+    )
+    SELECT
+        te.archetype_id,
+        date(t.date),
+        t.format_id,
+        COUNT(DISTINCT te.id),
+        COUNT(DISTINCT t.id),
+        COUNT(DISTINCT m.entry_id),
+        COUNT(DISTINCT CASE WHEN m.entry_id IS NOT NULL THEN t.id END),
+        COUNT(CASE WHEN m.result = 'WIN' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END),
+        COUNT(CASE WHEN m.result = 'WIN' AND m.mirror THEN 1 END),
+        COUNT(CASE WHEN m.result = 'LOSS' AND m.mirror THEN 1 END),
+        COUNT(CASE WHEN m.result = 'DRAW' AND m.mirror THEN 1 END)
+    FROM tournaments t
+    JOIN tournament_entries te ON te.tournament_id = t.id
+    LEFT JOIN matches m ON m.entry_id = te.id
+    WHERE :since IS NULL OR date(t.date) >= :since
+    GROUP BY te.archetype_id, date(t.date), t.format_id
+    """
+)
+
+
+DELETE_CARD_DAILY_STATS_SQL = text(
+    """
+    DELETE FROM card_daily_stats
+    WHERE :since IS NULL OR date >= :since
+    """
+)
+
+INSERT_CARD_DAILY_STATS_SQL = text(
+    """
+    INSERT INTO card_daily_stats (
+        card_id, date, format_id, board, decks_playing, total_copies, deck_rows
+    )
+    SELECT
+        dc.card_id,
+        date(t.date),
+        t.format_id,
+        dc.board,
+        COUNT(DISTINCT te.id),
+        SUM(dc.count),
+        COUNT(*)
+    FROM tournaments t
+    JOIN tournament_entries te ON te.tournament_id = t.id
+    JOIN deck_cards dc ON dc.entry_id = te.id
+    WHERE :since IS NULL OR date(t.date) >= :since
+    GROUP BY dc.card_id, date(t.date), t.format_id, dc.board
+    UNION ALL
+    SELECT
+        dc.card_id,
+        date(t.date),
+        t.format_id,
+        'ALL',
+        COUNT(DISTINCT te.id),
+        SUM(dc.count),
+        COUNT(*)
+    FROM tournaments t
+    JOIN tournament_entries te ON te.tournament_id = t.id
+    JOIN deck_cards dc ON dc.entry_id = te.id
+    WHERE :since IS NULL OR date(t.date) >= :since
+    GROUP BY dc.card_id, date(t.date), t.format_id
+    """
+)
+
+
+def refresh_archetype_daily_stats(session, since: Optional[date] = None) -> int:
+    """
+    Recompute archetype_daily_stats for every day on/after `since`
+    (or for all days when None). Returns the number of rows written.
+    Caller is responsible for committing.
+    """
+    params = {"since": since.isoformat() if since else None}
+    session.execute(DELETE_ARCHETYPE_DAILY_STATS_SQL, params)
+    result = session.execute(INSERT_ARCHETYPE_DAILY_STATS_SQL, params)
+    return result.rowcount
+
+
+def refresh_card_daily_stats(session, since: Optional[date] = None) -> int:
+    """
+    Recompute card_daily_stats for every day on/after `since`
+    (or for all days when None). Returns the number of rows written.
+    Caller is responsible for committing.
+    """
+    params = {"since": since.isoformat() if since else None}
+    session.execute(DELETE_CARD_DAILY_STATS_SQL, params)
+    result = session.execute(INSERT_CARD_DAILY_STATS_SQL, params)
+    return result.rowcount
+
+
+def refresh_all_rollups(session, since: Optional[date] = None) -> Dict[str, int]:
+    """
+    Recompute every rollup table for days on/after `since` (all days when None).
+    Returns rows written per table. Caller is responsible for committing.
+    """
+    return {
+        "archetype_daily_stats": refresh_archetype_daily_stats(session, since),
+        "card_daily_stats": refresh_card_daily_stats(session, since),
+    }
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Rebuild analysis rollup tables")
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="Only rebuild days on/after this date (YYYY-MM-DD format)",
+    )
+    args = parser.parse_args()
+
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+
+    SessionFactory = get_session_factory()
+    session = SessionFactory()
+    try:
+        written = refresh_all_rollups(session, args.since)
+        session.commit()
+        for table, rows in written.items():
+            print(f"✅ {table}: {rows} rows rebuilt")
+    except Exception as e:
+        print(f"❌ Error refreshing rollups: {e}")
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 """Decorator for automatically logging MCP tool calls."""
 
 import time
-import json
 from functools import wraps
 from typing import Callable
+import orjson
 from fastmcp import Context
 
 from .logging_config import mcp_logger
@@ -74,8 +74,10 @@ def log_tool_calls(func: Callable) -> Callable:
             # Prepare output data for logging (truncate if too large)
             output_data = result
             if isinstance(result, (dict, list)):
-                # Convert to JSON string to check size
-                result_json = json.dumps(result, default=str)
+                # Serialize to check size
+                result_json = orjson.dumps(
+                    result, default=str, option=orjson.OPT_NON_STR_KEYS
+                )
                 if len(result_json) > 10000:  # Limit to 10KB
                     if isinstance(result, dict):
                         output_data = {
@@ -51,8 +51,7 @@ def query_database(sql: str, limit: int = 1000, ctx: Context = None) -> Dict[str
     has_limit = " limit " in s.lower()
     stmt = text(s if has_limit else f"{s} LIMIT :_limit")
     with engine.connect() as conn:
-        rows = conn.execute(stmt, {"_limit": limit}).fetchall()
-    data = [dict(r._mapping) for r in rows]
+        data = [dict(r) for r in conn.execute(stmt, {"_limit": limit}).mappings()]
     return {
         "rowcount": len(data),
         "rows": data,
@@ -1,6 +1,7 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from ..analysis.card import search_card as compute_search_card
+from ..analysis.card import search_cards_bulk as compute_search_cards_bulk
 from .utils import engine
 from .mcp import mcp
 from fastmcp import Context
@@ -15,3 +16,25 @@ def search_card(query: str, ctx: Context = None) -> Dict[str, Any]:
     Delegates logic to shared analysis.search_card to avoid duplication.
     """
     return compute_search_card(engine, query)
+
+
+@log_tool_calls
+@mcp.tool
+def search_cards(names: List[str], ctx: Context = None) -> Dict[str, Any]:
+    """
+    Look up many cards by exact name at once (e.g. every card of a decklist).
+
+    One local DB query plus Scryfall /cards/collection calls of 75 names each,
+    instead of one search_card() round trip per card.
+
+    Args:
+        names: Exact card names (case-insensitive)
+
+    Returns:
+        Dict with cards (search_card-style details, in input order) and
+        not_found (names unknown both locally and on Scryfall)
+
+    Related Tools:
+    - search_card() for a single partial or misspelled name
+    """
+    return compute_search_cards_bulk(engine, names)
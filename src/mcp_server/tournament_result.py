@@ -8,6 +8,69 @@ from fastmcp import Context
 from .log_decorator import log_tool_calls
 
 
+# Tournament winners
+_WINNERS_SQL = text(
+    """
+    SELECT 
+        t.name as tournament_name,
+        t.date,
+        t.link,
+        a.name as winning_archetype,
+        p.handle as winner_handle,
+        COUNT(DISTINCT all_te.id) as tournament_size
+    FROM tournaments t
+    JOIN tournament_entries te ON t.id = te.tournament_id AND te.rank = 1
+    JOIN archetypes a ON te.archetype_id = a.id
+    JOIN players p ON te.player_id = p.id
+    JOIN tournament_entries all_te ON t.id = all_te.tournament_id
+    WHERE t.format_id = :format_id
+    AND t.date >= :start
+    AND t.date <= :end
+    GROUP BY t.id, t.name, t.date, t.link, a.name, p.handle
+    HAVING tournament_size >= :min_players
+    ORDER BY t.date DESC
+    LIMIT :limit
+    """
+)
+
+
+# Top 8 meta breakdown
+_TOP8_META_SQL = text(
+    """
+    SELECT 
+        a.name as archetype_name,
+        COUNT(*) as top8_appearances,
+        COUNT(CASE WHEN te.rank = 1 THEN 1 END) as wins,
+        ROUND(
+            CAST(COUNT(*) AS REAL) / 
+            (SELECT COUNT(*) 
+             FROM tournament_entries te2 
+             JOIN tournaments t2 ON te2.tournament_id = t2.id 
+             WHERE t2.format_id = :format_id 
+             AND t2.date >= :start 
+             AND t2.date <= :end 
+             AND te2.rank <= 8) * 100, 2
+        ) as top8_meta_share
+    FROM tournament_entries te
+    JOIN tournaments t ON te.tournament_id = t.id
+    JOIN archetypes a ON te.archetype_id = a.id
+    WHERE t.format_id = :format_id
+    AND t.date >= :start
+    AND t.date <= :end
+    AND te.rank <= 8
+    AND t.id IN (
+        SELECT t3.id 
+        FROM tournaments t3 
+        JOIN tournament_entries te3 ON t3.id = te3.tournament_id 
+        GROUP BY t3.id 
+        HAVING COUNT(DISTINCT te3.id) >= :min_players
+    )
+    GROUP BY a.id, a.name
+    ORDER BY top8_appearances DESC
+    """
+)
+
+
 @log_tool_calls
 @mcp.tool
 def get_tournament_results(
@@ -52,88 +115,16 @@ def get_tournament_results(
     if end < start:
         raise ValueError("end_date must be >= start_date")
 
-    # Get tournament winners
-    winners_sql = """
-        SELECT 
-            t.name as tournament_name,
-            t.date,
-            t.link,
-            a.name as winning_archetype,
-            p.handle as winner_handle,
-            COUNT(DISTINCT all_te.id) as tournament_size
-        FROM tournaments t
-        JOIN tournament_entries te ON t.id = te.tournament_id AND te.rank = 1
-        JOIN archetypes a ON te.archetype_id = a.id
-        JOIN players p ON te.player_id = p.id
-        JOIN tournament_entries all_te ON t.id = all_te.tournament_id
-        WHERE t.format_id = :format_id
-        AND t.date >= :start
-        AND t.date <= :end
-        GROUP BY t.id, t.name, t.date, t.link, a.name, p.handle
-        HAVING tournament_size >= :min_players
-        ORDER BY t.date DESC
-        LIMIT :limit
-    """
-
-    with engine.connect() as conn:
-        winners = conn.execute(
-            text(winners_sql),
-            {
-                "format_id": format_id,
-                "start": start,
-                "end": end,
-                "min_players": min_players,
-                "limit": limit,
-            },
-        ).fetchall()
-
-    # Get top 8 meta breakdown
-    top8_sql = """
-        SELECT 
-            a.name as archetype_name,
-            COUNT(*) as top8_appearances,
-            COUNT(CASE WHEN te.rank = 1 THEN 1 END) as wins,
-            ROUND(
-                CAST(COUNT(*) AS REAL) / 
-                (SELECT COUNT(*) 
-                 FROM tournament_entries te2 
-                 JOIN tournaments t2 ON te2.tournament_id = t2.id 
-                 WHERE t2.format_id = :format_id 
-                 AND t2.date >= :start 
-                 AND t2.date <= :end 
-                 AND te2.rank <= 8) * 100, 2
-            ) as top8_meta_share
-        FROM tournament_entries te
-        JOIN tournaments t ON te.tournament_id = t.id
-        JOIN archetypes a ON te.archetype_id = a.id
-        WHERE t.format_id = :format_id
-        AND t.date >= :start
-        AND t.date <= :end
-        AND te.rank <= 8
-        AND t.id IN (
-            SELECT t3.id 
-            FROM tournaments t3 
-            JOIN tournament_entries te3 ON t3.id = te3.tournament_id 
-            GROUP BY t3.id 
-            HAVING COUNT(DISTINCT te3.id) >= :min_players
-        )
-        GROUP BY a.id, a.name
-        ORDER BY top8_appearances DESC
-    """
-
+    params = {
+        "format_id": format_id,
+        "start": start,
+        "end": end,
+        "min_players": min_players,
+        "limit": limit,
+    }
     with engine.connect() as conn:
-        top8_meta = conn.execute(
-            text(top8_sql),
-            {
-                "format_id": format_id,
-                "start": start,
-                "end": end,
-                "min_players": min_players,
-            },
-        ).fetchall()
-
-    winners_data = [dict(r._mapping) for r in winners]
-    top8_data = [dict(r._mapping) for r in top8_meta]
+        winners_data = [dict(r) for r in conn.execute(_WINNERS_SQL, params).mappings()]
+        top8_data = [dict(r) for r in conn.execute(_TOP8_META_SQL, params).mappings()]
 
     return {
         "format_id": format_id,
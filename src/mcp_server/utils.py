@@ -1,5 +1,6 @@
 from datetime import datetime
 from contextlib import contextmanager
+from functools import lru_cache
 from sqlalchemy import event, text
 from ..models import get_engine, get_session_factory, get_alias_write_engine
 import re
@@ -86,10 +87,13 @@ def validate_select_only(sql: str) -> str:
     return s
 
 
+# Models reuse the same few windows across calls; datetimes are immutable
+@lru_cache(maxsize=2048)
 def validate_date_range(start_date: str, end_date: str) -> tuple[datetime, datetime]:
     """
     Validate and parse ISO date strings, ensuring end_date >= start_date.
-    Returns (start, end) as datetime objects.
+    Returns (start, end) as datetime objects. Invalid ranges raise and are
+    not cached.
     """
     try:
         start = datetime.fromisoformat(start_date)
@@ -150,16 +154,20 @@ def validate_alias_string(alias: str) -> tuple[bool, str]:
     return True, ""
 
 
+_ARCHETYPE_EXISTS_SQL = text(
+    "SELECT 1 FROM archetypes WHERE id = :archetype_id LIMIT 1"
+)
+
+
 def validate_archetype_exists(engine, archetype_id: str) -> bool:
     """
     Pre-validate that archetype_id exists in the archetypes table.
     Returns True if exists, False otherwise.
     """
     try:
-        check_sql = "SELECT 1 FROM archetypes WHERE id = :archetype_id LIMIT 1"
         with engine.connect() as conn:
             result = conn.execute(
-                text(check_sql), {"archetype_id": archetype_id}
+                _ARCHETYPE_EXISTS_SQL, {"archetype_id": archetype_id}
             ).first()
             return result is not None
     except Exception:
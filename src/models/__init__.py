@@ -21,6 +21,8 @@ from .reference import (
 )
 from .tournament import Tournament, TournamentEntry, DeckCard, Match
 from .tournament import TournamentSource, MatchResult, BoardType
+from .rollup import ArchetypeDailyStats, CardDailyStats
+from .search import fts_match_query
 
 __all__ = [
     # Base
@@ -44,6 +46,11 @@ __all__ = [
     "TournamentEntry",
     "DeckCard",
     "Match",
+    # Rollups
+    "ArchetypeDailyStats",
+    "CardDailyStats",
+    # Full-text search
+    "fts_match_query",
     # Enums
     "ChangeType",
     "TournamentSource",
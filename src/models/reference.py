@@ -9,6 +9,7 @@ from sqlalchemy import (
     UniqueConstraint,
     Boolean,
     FLOAT,
+    func,
     text,
 )
 from sqlalchemy.orm import relationship
@@ -211,6 +212,10 @@ class ArchetypeAlias(Base, TimestampMixin):
 
 # Create indexes for performance
 Index("idx_meta_change_format_date", MetaChange.format_id, MetaChange.date)
+# Expression indexes backing the LOWER(name) lookups in src/analysis
+Index("idx_archetype_name_lower", func.lower(Archetype.name))
+Index("idx_card_name_lower", func.lower(Card.name))
+Index("idx_archetype_alias_lower", func.lower(ArchetypeAlias.alias))
 
 # SQLite FTS5 virtual table for archetype fuzzy search
 # Note: This needs to be created via raw SQL as SQLAlchemy doesn't directly support FTS virtual tables
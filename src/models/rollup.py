@@ -0,0 +1,89 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
+from .base import Base
+
+
+class ArchetypeDailyStats(Base):
+    """
+    Per-archetype, per-day rollup of entries and match results.
+
+    Derived from tournaments/tournament_entries/matches; rebuilt by
+    ingest.refresh_rollups whenever ingest_entries writes. Never written by the MCP server.
+    """
+
+    __tablename__ = "archetype_daily_stats"
+
+    archetype_id = Column(
+        String(36),
+        ForeignKey(
+            "archetypes.id",
+            name="fk_archetype_daily_stats_archetype",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    )
+    date = Column(Date, primary_key=True)
+    format_id = Column(String(36), nullable=False)
+    entries = Column(Integer, nullable=False, default=0)
+    tournaments = Column(Integer, nullable=False, default=0)
+    # Entries/tournaments with at least one recorded match (meta report counts)
+    matched_entries = Column(Integer, nullable=False, default=0)
+    matched_tournaments = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    losses = Column(Integer, nullable=False, default=0)
+    draws = Column(Integer, nullable=False, default=0)
+    # Subset of wins/losses/draws played against the same archetype
+    mirror_wins = Column(Integer, nullable=False, default=0)
+    mirror_losses = Column(Integer, nullable=False, default=0)
+    mirror_draws = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ArchetypeDailyStats(archetype_id={self.archetype_id}, date='{self.date}')>"
+
+
+Index(
+    "idx_archetype_daily_stats_format_date",
+    ArchetypeDailyStats.format_id,
+    ArchetypeDailyStats.date,
+)
+
+
+class CardDailyStats(Base):
+    """
+    Per-card, per-day, per-board rollup of deck presence.
+
+    Derived from tournaments/tournament_entries/deck_cards; rebuilt by
+    ingest.refresh_rollups whenever ingest_entries writes. Never written by the MCP server.
+    """
+
+    __tablename__ = "card_daily_stats"
+
+    card_id = Column(
+        String(36),
+        ForeignKey(
+            "cards.id",
+            name="fk_card_daily_stats_card",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    )
+    date = Column(Date, primary_key=True)
+    # Part of the key: the same card is played in several formats on a day
+    format_id = Column(String(36), primary_key=True)
+    # 'MAIN', 'SIDE', or 'ALL' (decks playing the card in either board)
+    board = Column(String(4), primary_key=True)
+    decks_playing = Column(Integer, nullable=False, default=0)
+    total_copies = Column(Integer, nullable=False, default=0)
+    # deck_cards rows behind total_copies, for average copies per deck
+    deck_rows = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CardDailyStats(card_id={self.card_id}, date='{self.date}', board='{self.board}')>"
+
+
+# Presence windows filter format and board by equality and date by range
+Index(
+    "idx_card_daily_stats_format_board_date",
+    CardDailyStats.format_id,
+    CardDailyStats.board,
+    CardDailyStats.date,
+)
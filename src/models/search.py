@@ -0,0 +1,111 @@
+import re
+from typing import Optional
+
+from sqlalchemy import DDL, event
+
+from .reference import Archetype, Card, Player
+
+# SQLite FTS5 mirrors of archetype, card and player names for fuzzy search.
+# Standalone tables keyed by the UUID (rowids are not stable across VACUUM),
+# kept in sync by triggers. Names are stored lowercase by CaseInsensitiveText.
+FTS_TOKENIZE = "unicode61 remove_diacritics 2"
+
+ARCHETYPES_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS archetypes_fts
+    USING fts5(name, archetype_id UNINDEXED, tokenize='{FTS_TOKENIZE}')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archetypes_fts_ai AFTER INSERT ON archetypes BEGIN
+        INSERT INTO archetypes_fts(name, archetype_id) VALUES (new.name, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archetypes_fts_ad AFTER DELETE ON archetypes BEGIN
+        DELETE FROM archetypes_fts WHERE archetype_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS archetypes_fts_au AFTER UPDATE OF name ON archetypes BEGIN
+        DELETE FROM archetypes_fts WHERE archetype_id = old.id;
+        INSERT INTO archetypes_fts(name, archetype_id) VALUES (new.name, new.id);
+    END
+    """,
+]
+
+CARDS_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts
+    USING fts5(name, card_id UNINDEXED, tokenize='{FTS_TOKENIZE}')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_ai AFTER INSERT ON cards BEGIN
+        INSERT INTO cards_fts(name, card_id) VALUES (new.name, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_ad AFTER DELETE ON cards BEGIN
+        DELETE FROM cards_fts WHERE card_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cards_fts_au AFTER UPDATE OF name ON cards BEGIN
+        DELETE FROM cards_fts WHERE card_id = old.id;
+        INSERT INTO cards_fts(name, card_id) VALUES (new.name, new.id);
+    END
+    """,
+]
+
+# Player handles are matched by substring, so they use the trigram tokenizer:
+# LIKE '%x%' on the FTS columns is served by the index (patterns of 3+ chars)
+PLAYERS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS players_fts
+    USING fts5(handle, normalized_handle, player_id UNINDEXED, tokenize='trigram')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_ai AFTER INSERT ON players BEGIN
+        INSERT INTO players_fts(handle, normalized_handle, player_id)
+        VALUES (new.handle, new.normalized_handle, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_ad AFTER DELETE ON players BEGIN
+        DELETE FROM players_fts WHERE player_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_au
+    AFTER UPDATE OF handle, normalized_handle ON players BEGIN
+        DELETE FROM players_fts WHERE player_id = old.id;
+        INSERT INTO players_fts(handle, normalized_handle, player_id)
+        VALUES (new.handle, new.normalized_handle, new.id);
+    END
+    """,
+]
+
+# Databases built with Base.metadata.create_all get the mirrors too
+for _table, _statements in (
+    (Archetype.__table__, ARCHETYPES_FTS_DDL),
+    (Card.__table__, CARDS_FTS_DDL),
+    (Player.__table__, PLAYERS_FTS_DDL),
+):
+    for _statement in _statements:
+        event.listen(
+            _table, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+        )
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def fts_match_query(name: str) -> Optional[str]:
+    """
+    Build an FTS5 MATCH expression requiring every word of `name` as a prefix.
+
+    "Izzet Pro" -> '"izzet"* "pro"*'. Returns None when `name` has no word
+    characters (nothing to match).
+    """
+    tokens = _TOKEN_RE.findall(name.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
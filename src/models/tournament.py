@@ -199,10 +199,24 @@ class Match(Base, TimestampMixin):
 
 # Performance indexes
 Index("idx_tournament_date_format", Tournament.date, Tournament.format_id)
+Index("idx_tournament_format_date", Tournament.format_id, Tournament.date)
 Index(
     "idx_entry_tournament_player",
     TournamentEntry.tournament_id,
     TournamentEntry.player_id,
 )
-Index("idx_deck_card_entry_board", DeckCard.entry_id, DeckCard.board)
+Index(
+    "idx_entry_archetype_tournament",
+    TournamentEntry.archetype_id,
+    TournamentEntry.tournament_id,
+)
+# Covers the deck-composition joins (filter by entry/board, read card and count)
+Index(
+    "idx_deck_card_entry_board_card",
+    DeckCard.entry_id,
+    DeckCard.board,
+    DeckCard.card_id,
+    DeckCard.count,
+)
 Index("idx_match_entry_opponent", Match.entry_id, Match.opponent_entry_id)
+Index("idx_match_entry_result", Match.entry_id, Match.result)
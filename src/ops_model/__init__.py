@@ -10,6 +10,7 @@ from .base import (
 )
 from .models import FocusedChannel, DiscordPost, SocialMessage, Pass, SocialNotification
 from .chat_models import ChatSession, ChatMessage, ToolCall, ToolResult
+from .complexity import query_complexity, tool_call_complexity
 
 __all__ = [
     # Base and utils
@@ -31,4 +32,7 @@ __all__ = [
     "ChatMessage",
     "ToolCall",
     "ToolResult",
+    # Query complexity
+    "query_complexity",
+    "tool_call_complexity",
 ]
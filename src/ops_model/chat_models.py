@@ -1,4 +1,13 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, JSON
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    Boolean,
+    Integer,
+    SmallInteger,
+    ForeignKey,
+    JSON,
+)
 from sqlalchemy.orm import relationship
 from .base import Base, uuid_pk, TimestampMixin
 
@@ -74,6 +83,8 @@ class ToolCall(Base, TimestampMixin):
     # Optional metadata for query_database tool calls
     title = Column(String(200), nullable=True)
     column_names = Column(JSON, nullable=True)
+    # Complexity bucket of query_database calls, computed at insert time
+    complexity = Column(SmallInteger, nullable=True)  # 1=simple, 2=medium, 3=complex
 
     # Relationships
     message = relationship("ChatMessage", back_populates="tool_calls")
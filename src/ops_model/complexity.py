@@ -0,0 +1,54 @@
+"""Complexity scoring for query_database tool calls."""
+
+from typing import Any, Optional
+
+import orjson
+
+QUERY_TOOL_NAME = "query_database"
+
+# Buckets stored in tool_calls.complexity
+SIMPLE = 1
+MEDIUM = 2
+COMPLEX = 3
+
+
+def query_complexity(sql: str) -> int:
+    """Bucket a SQL query into SIMPLE, MEDIUM or COMPLEX."""
+    query = sql.upper()
+
+    score = 0
+    if "WITH" in query[:10] or " WITH " in query:
+        score += 3
+    if " OVER(" in query or " OVER (" in query:
+        score += 2
+    score += query.count(" JOIN ")
+    if query.count("SELECT") > 1:
+        score += 2
+    if " GROUP BY " in query:
+        score += 1
+
+    if score >= 4:
+        return COMPLEX
+    if score >= 2 or query.count("\n") > 5:
+        return MEDIUM
+    return SIMPLE
+
+
+def tool_call_complexity(tool_name: str, input_params: Any) -> Optional[int]:
+    """
+    Complexity bucket to store on a ToolCall row.
+
+    Only query_database calls are scored; other tools return None.
+    Unparseable parameters count as SIMPLE.
+    """
+    if tool_name != QUERY_TOOL_NAME:
+        return None
+    try:
+        params = (
+            input_params
+            if isinstance(input_params, dict)
+            else orjson.loads(input_params)
+        )
+        return query_complexity(params.get("sql", ""))
+    except Exception:
+        return SIMPLE
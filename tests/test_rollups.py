@@ -0,0 +1,348 @@
+"""
+The rollup-backed analysis queries must agree with the raw-table queries
+they replaced, as long as the rollups were refreshed after the last write.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.analysis import card as card_module
+from src.analysis import meta as meta_module
+from src.analysis.archetype import compute_archetype_winrate
+from src.analysis.card import compute_card_presence
+from src.analysis.meta import compute_meta_report
+from src.ingest.refresh_rollups import refresh_all_rollups
+from src.models import (
+    Archetype,
+    Base,
+    BoardType,
+    Card,
+    DeckCard,
+    Format,
+    Match,
+    MatchResult,
+    Player,
+    Tournament,
+    TournamentEntry,
+)
+
+
+# Raw-table queries as they were before the rollups existed
+RAW_META_REPORT_SQL = text(
+    """
+    WITH total_matches AS (
+        SELECT COUNT(*) as total_format_matches
+        FROM matches m
+        JOIN tournament_entries te ON m.entry_id = te.id
+        JOIN tournaments t ON te.tournament_id = t.id
+        WHERE t.format_id = :format_id
+          AND t.date >= :start
+          AND t.date <= :end
+    ),
+    archetype_stats AS (
+        SELECT
+            a.name as archetype_name,
+            COUNT(DISTINCT te.id) as total_entries,
+            COUNT(DISTINCT t.id) as tournaments_played,
+            COUNT(CASE WHEN m.result = 'WIN' THEN 1 END) as total_wins,
+            COUNT(CASE WHEN m.result = 'LOSS' THEN 1 END) as total_losses,
+            COUNT(CASE WHEN m.result = 'DRAW' THEN 1 END) as total_draws,
+            COUNT(*) as total_matches
+        FROM matches m
+        JOIN tournament_entries te ON m.entry_id = te.id
+        JOIN tournaments t ON te.tournament_id = t.id
+        JOIN archetypes a ON te.archetype_id = a.id
+        WHERE t.format_id = :format_id
+          AND t.date >= :start
+          AND t.date <= :end
+        GROUP BY a.id, a.name
+    )
+    SELECT
+        archetype_name,
+        total_entries,
+        tournaments_played,
+        total_wins,
+        total_losses,
+        total_draws,
+        total_matches,
+        ROUND(
+            CAST(total_matches AS REAL) /
+            CAST((SELECT total_format_matches FROM total_matches) AS REAL) * 100, 2
+        ) as presence_percent,
+        ROUND(
+            CAST(total_wins AS REAL) /
+            CAST((total_wins + total_losses) AS REAL) * 100, 2
+        ) as winrate_percent_no_draws
+    FROM archetype_stats
+    WHERE total_matches > 0
+    """
+)
+
+RAW_WINRATE_SQL = """
+    SELECT
+      COALESCE(SUM(CASE WHEN m.result = 'WIN'  THEN 1 ELSE 0 END), 0) AS wins,
+      COALESCE(SUM(CASE WHEN m.result = 'LOSS' THEN 1 ELSE 0 END), 0) AS losses,
+      COALESCE(SUM(CASE WHEN m.result = 'DRAW' THEN 1 ELSE 0 END), 0) AS draws
+    FROM matches m
+    JOIN tournament_entries e ON e.id = m.entry_id
+    JOIN tournaments t ON t.id = e.tournament_id
+    WHERE e.archetype_id = :arch_id
+      AND t.date >= :start
+      AND t.date <= :end
+"""
+
+RAW_CARD_PRESENCE_SQL = text(
+    """
+    WITH total_decks AS (
+        SELECT COUNT(DISTINCT te.id) as total_format_decks
+        FROM tournament_entries te
+        JOIN tournaments t ON te.tournament_id = t.id
+        WHERE t.format_id = :format_id
+          AND t.date >= :start
+          AND t.date <= :end
+    ),
+    card_stats AS (
+        SELECT
+            c.name as card_name,
+            SUM(dc.count) as total_copies,
+            COUNT(DISTINCT te.id) as decks_playing,
+            ROUND(AVG(CAST(dc.count AS REAL)), 2) as avg_copies_per_deck
+        FROM deck_cards dc
+        JOIN cards c ON dc.card_id = c.id
+        JOIN tournament_entries te ON dc.entry_id = te.id
+        JOIN tournaments t ON te.tournament_id = t.id
+        WHERE t.format_id = :format_id
+          AND t.date >= :start
+          AND t.date <= :end
+          AND (:board IS NULL OR dc.board = :board)
+          AND (NOT :exclude_lands OR NOT c.is_land)
+        GROUP BY c.id, c.name
+    )
+    SELECT
+        card_name,
+        total_copies,
+        decks_playing,
+        avg_copies_per_deck,
+        ROUND(
+            CAST(decks_playing AS REAL) /
+            CAST((SELECT total_format_decks FROM total_decks) AS REAL) * 100, 2
+        ) as presence_percent
+    FROM card_stats
+    WHERE decks_playing > 0
+    """
+)
+
+# Rollups are bucketed by day, so compare over whole-day windows
+WINDOWS = [
+    (datetime(2025, 1, 1), datetime(2025, 1, 31, 23, 59, 59, 999999)),
+    (datetime(2025, 1, 5), datetime(2025, 1, 20, 23, 59, 59, 999999)),
+    (datetime(2025, 1, 12), datetime(2025, 1, 12, 23, 59, 59, 999999)),
+]
+
+
+def _raw_params(start: datetime, end: datetime) -> dict:
+    return {"start": start.isoformat(" "), "end": end.isoformat(" ")}
+
+
+def _add_tournament(session, rng, fmt, archetypes, players, cards, day: date):
+    """One tournament with decklists and pairings; a few entries have no matches."""
+    tournament = Tournament(
+        name=f"{fmt.name} challenge {day}",
+        date=datetime.combine(day, datetime.min.time())
+        + timedelta(hours=rng.randint(0, 23), minutes=rng.randint(0, 59)),
+        format_id=fmt.id,
+    )
+    session.add(tournament)
+    session.flush()
+
+    entries = []
+    for player in rng.sample(players, 8):
+        entry = TournamentEntry(
+            tournament_id=tournament.id,
+            player_id=player.id,
+            archetype_id=rng.choice(archetypes).id,
+        )
+        session.add(entry)
+        entries.append(entry)
+    session.flush()
+
+    for entry in entries:
+        for card in rng.sample(cards, 8):
+            session.add(
+                DeckCard(
+                    entry_id=entry.id,
+                    card_id=card.id,
+                    count=rng.randint(1, 4),
+                    board=rng.choice([BoardType.MAIN, BoardType.SIDE]),
+                )
+            )
+
+    # The last two entries dropped before round one
+    paired = entries[:6]
+    for _ in range(3):
+        rng.shuffle(paired)
+        for e1, e2 in zip(paired[::2], paired[1::2]):
+            outcome = rng.choice(["WIN", "LOSS", "DRAW"])
+            opposite = {"WIN": "LOSS", "LOSS": "WIN", "DRAW": "DRAW"}[outcome]
+            mirror = e1.archetype_id == e2.archetype_id
+            pair_id = f"{e1.id}:{e2.id}:{rng.random()}"
+            for entry, opponent, result in ((e1, e2, outcome), (e2, e1, opposite)):
+                session.add(
+                    Match(
+                        entry_id=entry.id,
+                        opponent_entry_id=opponent.id,
+                        result=MatchResult[result],
+                        mirror=mirror,
+                        pair_id=pair_id,
+                    )
+                )
+    session.flush()
+    return tournament
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tournament.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    rng = random.Random(7)
+
+    formats = [Format(name="modern"), Format(name="pioneer")]
+    session.add_all(formats)
+    session.flush()
+    archetypes = {
+        fmt.id: [
+            Archetype(format_id=fmt.id, name=f"{fmt.name} deck {i}") for i in range(4)
+        ]
+        for fmt in formats
+    }
+    for group in archetypes.values():
+        session.add_all(group)
+    players = [Player(handle=f"p{i}", normalized_handle=f"p{i}") for i in range(24)]
+    cards = [
+        Card(name=f"card {i}", scryfall_oracle_id=f"oracle-{i}", is_land=i % 4 == 0)
+        for i in range(20)
+    ]
+    session.add_all(players + cards)
+    session.flush()
+
+    for day in range(1, 29):
+        fmt = formats[day % 2]
+        _add_tournament(
+            session, rng, fmt, archetypes[fmt.id], players, cards, date(2025, 1, day)
+        )
+    refresh_all_rollups(session)
+    session.commit()
+
+    yield engine, session, rng, formats, archetypes, players, cards
+    session.close()
+    engine.dispose()
+
+
+def _assert_rollups_match_raw(engine, formats, archetypes):
+    # Results are memoized for five minutes; compare against fresh queries
+    meta_module._meta_report_rows.cache_clear()
+    card_module._card_presence_rows.cache_clear()
+
+    with engine.connect() as conn:
+        for fmt in formats:
+            for start, end in WINDOWS:
+                params = {"format_id": fmt.id, **_raw_params(start, end)}
+
+                raw = [
+                    dict(r)
+                    for r in conn.execute(RAW_META_REPORT_SQL, params).mappings()
+                ]
+                report = compute_meta_report(engine, fmt.id, start, end, limit=20)
+                key = lambda row: row["archetype_name"]  # noqa: E731
+                assert sorted(report["archetypes"], key=key) == sorted(raw, key=key)
+
+                for arch in archetypes[fmt.id]:
+                    for exclude_mirror in (True, False):
+                        sql = RAW_WINRATE_SQL + (
+                            " AND m.mirror = 0" if exclude_mirror else ""
+                        )
+                        raw = (
+                            conn.execute(text(sql), {"arch_id": arch.id, **params})
+                            .mappings()
+                            .one()
+                        )
+                        result = compute_archetype_winrate(
+                            engine, arch.id, start, end, exclude_mirror
+                        )
+                        assert (result["wins"], result["losses"], result["draws"]) == (
+                            raw["wins"],
+                            raw["losses"],
+                            raw["draws"],
+                        )
+
+                for board in (None, "MAIN", "SIDE"):
+                    for exclude_lands in (True, False):
+                        raw = [
+                            dict(r)
+                            for r in conn.execute(
+                                RAW_CARD_PRESENCE_SQL,
+                                {
+                                    **params,
+                                    "board": board,
+                                    "exclude_lands": exclude_lands,
+                                },
+                            ).mappings()
+                        ]
+                        presence = compute_card_presence(
+                            engine, fmt.id, start, end, board, exclude_lands, limit=100
+                        )
+                        key = lambda row: row["card_name"]  # noqa: E731
+                        assert sorted(presence["cards"], key=key) == sorted(
+                            raw, key=key
+                        )
+
+
+def test_rollups_match_raw_tables(db):
+    engine, _, _, formats, archetypes, _, _ = db
+    _assert_rollups_match_raw(engine, formats, archetypes)
+
+
+def test_incremental_refresh_matches_raw_tables(db):
+    engine, session, rng, formats, archetypes, players, cards = db
+    fmt = formats[0]
+    _assert_rollups_match_raw(engine, formats, archetypes)
+
+    # A late tournament plus an archetype fix on an earlier one, refreshed from that day
+    _add_tournament(
+        session, rng, fmt, archetypes[fmt.id], players, cards, date(2025, 1, 20)
+    )
+    entry = (
+        session.query(TournamentEntry)
+        .join(Tournament)
+        .filter(
+            Tournament.format_id == fmt.id, Tournament.date >= datetime(2025, 1, 14)
+        )
+        .first()
+    )
+    entry.archetype_id = archetypes[fmt.id][0].id
+    since = entry.tournament.date.date()
+    refresh_all_rollups(session, since)
+    session.commit()
+
+    _assert_rollups_match_raw(engine, formats, archetypes)
+
+
+def test_cached_results_are_not_shared(db):
+    engine, _, _, formats, _, _, _ = db
+    start, end = WINDOWS[0]
+
+    report = compute_meta_report(engine, formats[0].id, start, end)
+    report["archetypes"][0]["total_entries"] = -1
+    report["archetypes"].clear()
+    again = compute_meta_report(engine, formats[0].id, start, end)
+    assert again["archetypes"] and again["archetypes"][0]["total_entries"] > 0
+
+    presence = compute_card_presence(engine, formats[0].id, start, end)
+    presence["cards"][0]["decks_playing"] = -1
+    again = compute_card_presence(engine, formats[0].id, start, end)
+    assert again["cards"][0]["decks_playing"] > 0
@@ -0,0 +1,102 @@
+"""
+search_cards_bulk resolves a whole list of names with one local query and
+batched Scryfall /cards/collection calls.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.analysis import card as card_module
+from src.analysis.card import search_cards_bulk
+from src.models import Base, Card
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"data": self._data}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tournament.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        Card(name=f"Card {i}", scryfall_oracle_id=f"oracle-{i}", colors="R")
+        for i in range(10)
+    )
+    session.commit()
+    session.close()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def scryfall(monkeypatch):
+    """Fake /cards/collection that knows 'card N' for N < 150."""
+    calls = []
+
+    def request(method, url, timeout=None, json=None, **kwargs):
+        calls.append((time.monotonic(), [i["name"] for i in json["identifiers"]]))
+        data = []
+        for identifier in json["identifiers"]:
+            n = int(identifier["name"].split()[-1])
+            if n < 150:
+                data.append(
+                    {
+                        "name": f"Card {n}",
+                        "oracle_id": f"oracle-{n}",
+                        "type_line": "Instant",
+                        "colors": ["R"],
+                    }
+                )
+        return _FakeResponse(data)
+
+    card_module._scryfall_cache.clear()
+    monkeypatch.setattr(card_module._scryfall_session, "request", request)
+    yield calls
+    card_module._scryfall_cache.clear()
+
+
+def test_batches_and_matches_by_oracle_id(engine, scryfall):
+    names = [f"card {i}" for i in range(160)]
+    result = search_cards_bulk(engine, names)
+
+    # 160 names: three POSTs of at most 75 identifiers, 100 ms apart
+    assert [len(batch) for _, batch in scryfall] == [75, 75, 10]
+    starts = [t for t, _ in scryfall]
+    assert all(b - a >= 0.095 for a, b in zip(starts, starts[1:]))
+
+    by_name = {c["name"]: c for c in result["cards"]}
+    assert len(result["cards"]) == 150
+    assert result["not_found"] == [f"card {i}" for i in range(150, 160)]
+    assert by_name["Card 3"]["card_id"] is not None
+    assert by_name["Card 3"]["type"] == "Instant"
+    assert by_name["Card 42"]["card_id"] is None
+
+    # Cached names are not fetched again
+    search_cards_bulk(engine, ["CARD 3"])
+    assert len(scryfall) == 3
+
+
+def test_falls_back_to_local_rows_when_scryfall_fails(engine, monkeypatch):
+    def request(*args, **kwargs):
+        raise RuntimeError("Scryfall down")
+
+    card_module._scryfall_cache.clear()
+    monkeypatch.setattr(card_module._scryfall_session, "request", request)
+
+    # Local names are stored lowercased
+    result = search_cards_bulk(engine, ["CARD 1", "card 99"])
+    assert [c["name"] for c in result["cards"]] == ["card 1"]
+    assert result["cards"][0]["type"] is None
+    assert result["not_found"] == ["card 99"]